@@ -5,6 +5,16 @@ Trebuchet?!
 jramaswami
 """
 
+
+import collections
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import output
+
+
 DIGITS = {
     "0": 0, "1": 1, "2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9,
     "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
@@ -12,6 +22,76 @@ DIGITS = {
 }
 
 
+def build_automaton(words):
+    """
+    Build an Aho-Corasick automaton for words, a dict from word to value.
+
+    Returns the transition table, indexed by state and then by character
+    code, and for each state the value of the word that ends on entering
+    it, or None.  State 0 is the start.  Lines must be ASCII.
+    """
+    # Build the trie.
+    trie = [{}]
+    values = [None]
+    for word, value in words.items():
+        state = 0
+        for char in word:
+            if char not in trie[state]:
+                trie.append({})
+                values.append(None)
+                trie[state][char] = len(trie) - 1
+            state = trie[state][char]
+        values[state] = value
+
+    # Fill in the transitions for every character, breadth first so that the
+    # state a failure falls back to is always complete before it is used.
+    table = [[0] * 128 for _ in trie]
+    fallback = [0 for _ in trie]
+    queue = collections.deque([0])
+    while queue:
+        state = queue.popleft()
+        if state > 0:
+            table[state] = list(table[fallback[state]])
+            if values[state] is None:
+                values[state] = values[fallback[state]]
+        for char, child in trie[state].items():
+            # On a mismatch the child falls back to where its parent's
+            # fallback goes on the same character.
+            fallback[child] = table[fallback[state]][ord(char)] if state > 0 else 0
+            table[state][ord(char)] = child
+            queue.append(child)
+    return table, values
+
+
+# No word is part of another, so the first word to end in a scan is also the
+# first word to start: the leftmost digit going forward and the rightmost
+# going backward.
+FORWARD = build_automaton(DIGITS)
+BACKWARD = build_automaton({word[::-1]: value for word, value in DIGITS.items()})
+
+
+def first_match(chars, automaton):
+    "Return the value of the first word to end in chars, or None"
+    table, values = automaton
+    state = 0
+    for char in chars:
+        state = table[state][ord(char)]
+        if values[state] is not None:
+            return values[state]
+    return None
+
+
+def test_first_match():
+    assert all(a == b or a not in b for a in DIGITS for b in DIGITS)
+    assert first_match('xxeightwo', FORWARD) == 8
+    assert first_match(reversed('xxeightwo'), BACKWARD) == 2
+    assert first_match('oneight', FORWARD) == 1
+    assert first_match(reversed('oneight'), BACKWARD) == 8
+    assert first_match('thrthree', FORWARD) == 3
+    assert first_match('ninine', FORWARD) == 9
+    assert first_match('abc', FORWARD) is None
+
+
 def recover_calibration_code_a(line):
     "Return two-digit number formed by the first and last digit"
     digits = [c for c in line if c.isdigit()]
@@ -30,6 +110,15 @@ def get_calibration_value(lines, func):
     return sum(func(t) for t in lines)
 
 
+def get_calibration_values(lines, funcs):
+    "Return the calibration value for each of funcs in one pass over lines"
+    values = [0 for _ in funcs]
+    for line in lines:
+        for i, func in enumerate(funcs):
+            values[i] += func(line)
+    return values
+
+
 def test_get_calibration_value():
     "Test for get_calibration_value()"
     lines_a = ["1abc2", "pqr3stu8vwx", "a1b2c3d4e5f", "treb7uchet"]
@@ -46,11 +135,9 @@ def test_get_calibration_value():
 
 def recover_calibration_code_b(line):
     "Return calibration code taking into account digits as words"
-    left_posns = [line.find(d) for d in DIGITS]
-    right_posns = [line.rfind(d) for d in DIGITS]
-    _, left_digit = min((i, d) for i, d in zip(left_posns, DIGITS) if i >= 0)
-    _, right_digit = max((i, d) for i, d in zip(right_posns, DIGITS) if i >= 0)
-    return (10 * DIGITS[left_digit]) + DIGITS[right_digit]
+    left_digit = first_match(line, FORWARD)
+    right_digit = first_match(reversed(line), BACKWARD)
+    return (10 * left_digit) + right_digit
 
 
 def test_recover_calibration_code_b():
@@ -65,20 +152,26 @@ def test_recover_calibration_code_b():
     assert [recover_calibration_code_b(l) for l in lines] == expected
 
 
+def solve_a(lines):
+    return get_calibration_value(lines, recover_calibration_code_a)
+
+
+def solve_b(lines):
+    return get_calibration_value(lines, recover_calibration_code_b)
+
 
 def main():
     "Main program."
-    import pyperclip
-    import sys
-    lines = [line.strip() for line in sys.stdin]
-    calibration_value_a = get_calibration_value(lines, recover_calibration_code_a)
+    lines = (line.strip() for line in sys.stdin)
+    calibration_value_a, calibration_value_b = get_calibration_values(
+        lines, (recover_calibration_code_a, recover_calibration_code_b)
+    )
     print('The calibration a is', calibration_value_a)
     assert calibration_value_a == 56042
-    calibration_value_b = get_calibration_value(lines, recover_calibration_code_b)
     print('The calibration b is', calibration_value_b)
     assert calibration_value_b == 55358
-    pyperclip.copy(str(calibration_value_b))
-    print('It has been copied to the clipboard')
+    if output.copy(calibration_value_b):
+        print('It has been copied to the clipboard')
 
 
 if __name__ == '__main__':
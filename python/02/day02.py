@@ -6,60 +6,109 @@ jramaswami
 """
 
 
-import functools
-import operator
+import array
+import collections
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import output
+
+
+CUBES = {'red': 12, 'green': 13, 'blue': 14}
+
+
+# The games as columns: the game IDs, the color names with those in CUBES
+# first and any others in the order they were seen, and an array with one row per game holding the most cubes of
+# each color drawn at once in that game.
+Games = collections.namedtuple('Games', ['ids', 'colors', 'max_cubes'])
 
 
 def parse_input(input):
-    "Parse input into a list of lists of ..."
-    games = []
+    "Parse input into Games"
+    # The colors in the bag always have a column, even if never drawn.
+    colors = {c: i for i, c in enumerate(CUBES)}
+    ids = array.array('q')
+    # Every draw as three columns: the game's row, the color and the number.
+    draw_games, draw_colors, draw_numbers = array.array('q'), array.array('q'), array.array('q')
     for line in input:
-        games.append([])
-        # Parse game number and game rounds
         game_clause, line = (t.strip() for t in line.split(':'))
-        game_number = game_clause.split()[-1][:-1]
-        # Parse game rounds
-        game_rounds = (t.strip() for t in line.split(';'))
-        for round in game_rounds:
-            games[-1].append([])
-            for draw in (t.strip() for t in round.split(',')):
+        game = len(ids)
+        ids.append(int(game_clause.split()[-1]))
+        for round in line.split(';'):
+            for draw in round.split(','):
                 number_drawn, color_drawn = draw.split()
-                number_drawn = int(number_drawn)
-                games[-1][-1].append((number_drawn, color_drawn))
-    return games
+                draw_games.append(game)
+                draw_colors.append(colors.setdefault(color_drawn, len(colors)))
+                draw_numbers.append(int(number_drawn))
+    max_cubes = np.zeros((len(ids), len(colors)), dtype=np.int64)
+    cells = (np.frombuffer(draw_games, dtype=np.int64), np.frombuffer(draw_colors, dtype=np.int64))
+    np.maximum.at(max_cubes, cells, np.frombuffer(draw_numbers, dtype=np.int64))
+    return Games(np.frombuffer(ids, dtype=np.int64), list(colors), max_cubes)
+
+
+def test_parse_input():
+    with open('../../data/02/test02a.txt', 'r') as infile:
+        games = parse_input(infile)
+    assert games.ids.tolist() == [1, 2, 3, 4, 5]
+    assert games.colors == ['red', 'green', 'blue']
+    assert games.max_cubes[2].tolist() == [20, 13, 6]
+
+
+def possible_games(games, cubes):
+    """
+    Return a boolean array that is True for the games that are possible with
+    the cubes available, a dict from color to number of cubes.
+    """
+    limits = np.array([cubes.get(color, 0) for color in games.colors], dtype=np.int64)
+    return (games.max_cubes <= limits).all(axis=1)
+
+
+def cube_powers(games):
+    "Return the power of the fewest cubes needed to play each game."
+    return games.max_cubes.prod(axis=1)
+
+
+def solve_a(games, cubes=CUBES):
+    "Return the sum of the IDs of the possible games."
+    return int(games.ids[possible_games(games, cubes)].sum())
+
+
+def test_solve_a():
+    with open('../../data/02/test02a.txt', 'r') as infile:
+        games = parse_input(infile)
+    assert solve_a(games) == 8
+    assert solve_a(games, {'red': 20, 'green': 13, 'blue': 6}) == 1 + 2 + 3 + 5
 
 
-def is_game_possible(game):
-    "Return True if the game is possible with the cubes available."
-    cubes={'red': 12, 'green': 13, 'blue': 14}
-    for round in game:
-        for number_drawn, color_drawn in round:
-            if number_drawn > cubes[color_drawn]:
-                return False
-    return True
+def solve_b(games):
+    "Return the sum of the power of the minimum sets of cubes."
+    return int(cube_powers(games).sum())
 
 
-def max_cubes_needed(game):
-    "Return the maximum number of cubes needed to play the game."
-    cubes = {'red': 0, 'green': 0, 'blue': 0}
-    for round in game:
-        for number_drawn, color_drawn in round:
-            cubes[color_drawn] = max(cubes[color_drawn], number_drawn)
-    return cubes
+def test_solve_b():
+    with open('../../data/02/test02a.txt', 'r') as infile:
+        games = parse_input(infile)
+    assert cube_powers(games).tolist() == [48, 12, 1560, 630, 36]
+    assert solve_b(games) == 2286
+    # No blue cube is drawn, so every power is 0.
+    games = parse_input(['Game 1: 3 red, 4 green', 'Game 2: 1 red; 2 green'])
+    assert solve_b(games) == 0
 
 
 def main():
     "Main program"
-    import sys
-    import pyperclip
     games = parse_input(sys.stdin)
-    soln_a = sum([i for i, g in enumerate(games, start=1) if is_game_possible(g)])
+    soln_a = solve_a(games)
     print('The sum of IDs of possible games is', soln_a)
     assert soln_a == 2486
-    soln_b = sum(functools.reduce(operator.mul, max_cubes_needed(g).values(), 1) for g in games)
+    soln_b = solve_b(games)
     print('The sum of the power of the games is', soln_b)
     assert soln_b == 87984
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
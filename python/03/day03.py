@@ -7,64 +7,44 @@ jramaswami
 
 
 import collections
+import os
+import re
+import sys
 
+import numpy as np
 
-OFFSETS = (
-    (0, 1), (0, -1), (1, 0), (-1, 0),
-    (1, 1), (-1, 1), (1, -1), (-1, -1)
-)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
+from aoc import grid as aocgrid
+from aoc import output
 
-def solve(grid):
-    def inbounds(r, c):
-        return r >= 0 and c >= 0 and r < len(grid) and c < len(grid[r])
-
-    def neighbors(r, c):
-        for dr, dc in OFFSETS:
-            r0, c0 = r + dr, c + dc
-            if inbounds(r0, c0):
-                yield r0, c0
 
-    visited = [[False for _ in row] for row in grid]
-
-    queue = collections.deque()
+def find_numbers(grid):
+    "Yield (row, first col, col after last, value) for every number in grid"
     for r, row in enumerate(grid):
-        for c, val in enumerate(row):
-            if grid[r][c] != '.' and not grid[r][c].isdigit():
-                queue.append((r, c))
+        for match in re.finditer(r'\d+', row):
+            yield r, match.start(), match.end(), int(match.group())
+
 
-    while queue:
-        r, c = queue.popleft()
-        for r0, c0 in neighbors(r, c):
-            if not visited[r0][c0] and grid[r0][c0].isdigit():
-                queue.append((r0, c0))
-                visited[r0][c0] = True
+def solve(grid):
+    schematic = aocgrid.Grid.from_lines(grid)
+    symbols = ~schematic.mask('.0123456789')
+    # A number is a part number when any of its digits is next to a symbol.
+    near_symbol = aocgrid.dilate(symbols, aocgrid.ALL_NEIGHBORS)
+    # Pad the gears so the window around a number never needs clipping.
+    gears = np.pad(schematic.mask('*'), 1)
 
     numbers = []
-    gears = collections.defaultdict(list)
+    gear_numbers = collections.defaultdict(list)
+    for r, c1, c2, value in find_numbers(grid):
+        if near_symbol[r, c1:c2].any():
+            numbers.append(value)
+        # Rows r-1..r+1 and cols c1-1..c2 shifted by the padding.
+        for gr, gc in zip(*np.nonzero(gears[r:r+3, c1:c2+2])):
+            gear_numbers[(r + int(gr) - 1, c1 + int(gc) - 1)].append(value)
 
-    curr = 0
-    is_gear = False
-    gear_posn = None
-    for r, row in enumerate(grid):
-        for c, val in enumerate(row):
-            if visited[r][c]:
-                curr *= 10
-                curr += int(grid[r][c])
-                for r0, c0 in neighbors(r, c):
-                    if grid[r0][c0] == '*':
-                        is_gear = True
-                        gear_posn = (r0, c0)
-            else:
-                if curr > 0:
-                    numbers.append(curr)
-                    if is_gear:
-                        gears[gear_posn].append(curr)
-                curr = 0
-                is_gear = False
-                gear_posn = None
     soln_a = sum(numbers)
-    soln_b = sum(t[0] * t[1] for t in gears.values() if len(t) > 1)
+    soln_b = sum(t[0] * t[1] for t in gear_numbers.values() if len(t) == 2)
     return soln_a, soln_b
 
 
@@ -78,16 +58,26 @@ def test_solve():
     assert soln_b == expected_b
 
 
+def test_solve_edges():
+    # Numbers touching the border, a gear next to a single number, a gear on
+    # the diagonal of a number, and a gear next to three numbers.
+    grid = [
+        '12*..',
+        '...*3',
+        '4*5..',
+        '.6...',
+    ]
+    assert solve(grid) == (12 + 3 + 4 + 5 + 6, 3 * 5)
+
+
 def main():
     "Main program"
-    import sys
-    import pyperclip
     grid = [line.strip() for line in sys.stdin]
     soln_a, soln_b = solve(grid)
     print('The sum of the numbers adjacent to the symbols is', soln_a)
     assert soln_a == 531932
     print('The sum of the gear ratios is', soln_b)
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
     assert soln_b == 73646890
 
 
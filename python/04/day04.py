@@ -5,6 +5,16 @@ Scratchcards
 """
 
 
+import collections
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import loader
+from aoc import output
+
+
 def parse_card(line):
     """
     Parse the card from the given line.
@@ -22,17 +32,28 @@ def parse_card(line):
 
 def count_your_winning_numbers(winning_numbers, numbers_you_have):
     "Return the count of cards that you have that are in winning numbers."
+    winning_numbers = set(winning_numbers)
     return sum(1 for n in numbers_you_have if n in winning_numbers)
 
 
-def compute_card_score(winning_numbers, numbers_you_have):
-    "Compute the score of the card according to the Elf's rules."
-    your_winning_numbers = count_your_winning_numbers(winning_numbers, numbers_you_have)
+def count_matches(cards):
+    "Yield the count of your winning numbers for each card."
+    for card in cards:
+        yield count_your_winning_numbers(*card)
+
+
+def score_matches(your_winning_numbers):
+    "Return the score of a card with the given count of your winning numbers."
     if your_winning_numbers > 0:
         return pow(2, your_winning_numbers - 1)
     return 0
 
 
+def compute_card_score(winning_numbers, numbers_you_have):
+    "Compute the score of the card according to the Elf's rules."
+    return score_matches(count_your_winning_numbers(winning_numbers, numbers_you_have))
+
+
 def test_compute_card_score():
     with open('../../data/04/test04a.txt') as testfile:
         cards = [parse_card(line) for line in testfile.readlines()]
@@ -40,9 +61,14 @@ def test_compute_card_score():
     assert [compute_card_score(*c) for c in cards] == expected
 
 
+def total_score(matches):
+    "Return the total score of cards with the given counts of winning numbers."
+    return sum(score_matches(m) for m in matches)
+
+
 def solve_a(cards):
     "Return the total score of the cards in the input lines."
-    return sum(compute_card_score(*c) for c in cards)
+    return total_score(count_matches(cards))
 
 
 def test_solve_a():
@@ -51,14 +77,42 @@ def test_solve_a():
     assert solve_a(cards) == 13
 
 
+def count_cards(matches):
+    """
+    Return the number of cards you end up with, given the count of winning
+    numbers on each card in order.
+
+    Each card adds its copies to the next few cards.  Rather than keeping
+    the copies of every card, keep the changes in the number of copies won
+    for the cards just ahead, as differences: pending[0] is for the next
+    card.  Only as many cards ahead as the largest win are ever held.
+    """
+    total = 0
+    copies_won = 0
+    pending = collections.deque()
+    for your_winning_numbers in matches:
+        if pending:
+            copies_won += pending.popleft()
+        copies = 1 + copies_won
+        total += copies
+        if your_winning_numbers > 0:
+            while len(pending) <= your_winning_numbers:
+                pending.append(0)
+            pending[0] += copies
+            pending[your_winning_numbers] -= copies
+    return total
+
+
+def test_count_cards():
+    assert count_cards([4, 2, 2, 1, 0, 0]) == 30
+    assert count_cards([]) == 0
+    assert count_cards([1, 0]) == 3
+    assert count_cards([2, 1, 0]) == 1 + 2 + 4
+
+
 def solve_b(cards):
     "Return the number of cards you end up with after all the copying."
-    card_copies = [1 for _ in cards]
-    for card_index, _ in enumerate(cards):
-        copies_you_win = count_your_winning_numbers(*cards[card_index])
-        for offset in range(1, copies_you_win+1):
-            card_copies[card_index+offset] += card_copies[card_index]
-    return sum(card_copies)
+    return count_cards(count_matches(cards))
 
 
 def test_solve_b():
@@ -69,16 +123,16 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
-    with open('../../data/04/input04.txt') as infile:
-        cards = [parse_card(l) for l in infile.readlines()]
-    soln_a = solve_a(cards)
+    # Both parts only need the count of winning numbers on each card.
+    cards = (parse_card(l) for l in loader.iter_lines('../../data/04/input04.txt'))
+    matches = list(count_matches(cards))
+    soln_a = total_score(matches)
     print('The total points for the scratchcards is', soln_a)
     assert soln_a == 23028
-    soln_b = solve_b(cards)
+    soln_b = count_cards(matches)
     print('You end up with', soln_b, 'total scratchcards')
     assert soln_b == 9236992
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
@@ -6,7 +6,14 @@ jramaswami
 """
 
 
+import bisect
 import collections
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import output
 
 
 Entry = collections.namedtuple('Entry', ['next', 'curr', 'range'])
@@ -47,89 +54,136 @@ def transform_seed(seed, almanac):
     return seed
 
 
+# A piecewise linear map of the nonnegative integers: x in
+# [starts[i], starts[i+1]) maps to x + deltas[i].  starts[0] is always 0 and
+# the last piece runs on forever.
+Piecewise = collections.namedtuple('Piecewise', ['starts', 'deltas'])
+
+
+IDENTITY = Piecewise((0,), (0,))
+
+
+def merge_pieces(pieces):
+    "Return the Piecewise for sorted (start, delta) pairs, joining equal neighbors."
+    starts, deltas = [], []
+    for start, delta in pieces:
+        if deltas and deltas[-1] == delta:
+            continue
+        starts.append(start)
+        deltas.append(delta)
+    return Piecewise(tuple(starts), tuple(deltas))
+
+
+def compile_page(page):
+    "Return the Piecewise for a page of the almanac, with gaps mapping to themselves."
+    pieces = []
+    end = 0
+    for entry in sorted(page, key=lambda e: e.curr):
+        if entry.curr > end:
+            pieces.append((end, 0))
+        pieces.append((entry.curr, entry.next - entry.curr))
+        end = entry.curr + entry.range
+    if not pieces or pieces[0][0] > 0:
+        pieces.insert(0, (0, 0))
+    pieces.append((end, 0))
+    return merge_pieces(pieces)
+
+
+def compose(first, second):
+    "Return the Piecewise for applying first and then second."
+    pieces = []
+    for i, (start, delta) in enumerate(zip(first.starts, first.deltas)):
+        # The piece [start, end) lands on [start + delta, end + delta), which
+        # is split wherever a piece of second begins.
+        j = bisect.bisect_right(second.starts, start + delta) - 1
+        pieces.append((start, delta + second.deltas[j]))
+        end = first.starts[i+1] if i + 1 < len(first.starts) else None
+        for k in range(j + 1, len(second.starts)):
+            if end is not None and second.starts[k] >= end + delta:
+                break
+            pieces.append((second.starts[k] - delta, delta + second.deltas[k]))
+    return merge_pieces(pieces)
+
+
+def compile_almanac(almanac):
+    "Return the Piecewise from seed to location for the whole almanac."
+    function = IDENTITY
+    for page in almanac:
+        function = compose(function, compile_page(page))
+    return function
+
+
+def lookup(function, x):
+    "Return the value of function at x."
+    i = bisect.bisect_right(function.starts, x) - 1
+    return x + function.deltas[i]
+
+
+def transform_seeds(seeds, function):
+    "Return the values of function at every seed in an array of seeds."
+    import numpy as np
+    seeds = np.asarray(seeds, dtype=np.int64)
+    starts = np.array(function.starts, dtype=np.int64)
+    deltas = np.array(function.deltas, dtype=np.int64)
+    return seeds + deltas[np.searchsorted(starts, seeds, side='right') - 1]
+
+
+def lowest_location(seeds, function):
+    "Return the lowest value of function over an array of seeds."
+    return int(transform_seeds(seeds, function).min())
+
+
+def map_range(function, lo, hi):
+    "Yield the (lo, hi) ranges, hi exclusive, that function maps [lo, hi) onto."
+    i = bisect.bisect_right(function.starts, lo) - 1
+    while lo < hi:
+        end = function.starts[i+1] if i + 1 < len(function.starts) else hi
+        end = min(end, hi)
+        yield lo + function.deltas[i], end + function.deltas[i]
+        lo = end
+        i += 1
+
+
+def test_compile_almanac():
+    with open('../../data/05/test05a.txt') as infile:
+        lines = [t.strip() for t in infile.readlines()]
+    seeds, almanac = parse_input(lines)
+    function = compile_almanac(almanac)
+    assert function.starts[0] == 0
+    assert list(function.starts) == sorted(set(function.starts))
+    for seed in range(200):
+        assert lookup(function, seed) == transform_seed(seed, almanac)
+    locations = {x for lo, hi in map_range(function, 0, 200) for x in range(lo, hi)}
+    assert locations == {transform_seed(seed, almanac) for seed in range(200)}
+    assert sum(hi - lo for lo, hi in map_range(function, 3, 150)) == 147
+    assert compile_page([]) == IDENTITY
+    assert transform_seeds(range(200), function).tolist() == [
+        lookup(function, seed) for seed in range(200)
+    ]
+    assert lowest_location(seeds, function) == 35
+    assert solve_a(seeds, almanac) == 35
+    assert solve_b(seeds, almanac) == 46
+
+
 def solve_a(seeds, almanac):
     "Solve first part of puzzle."
-    return min(transform_seed(seed, almanac) for seed in seeds)
+    return lowest_location(seeds, compile_almanac(almanac))
 
 
 def solve_b(seeds, almanac):
     "Solve second part of puzzle."
-    # Transform seeds into ranges.
-    seed_ranges = []
-    for i, _ in enumerate(seeds):
-        if i % 2 == 0:
-            seed_ranges.append((seeds[i], seeds[i] + seeds[i+1] - 1))
-    # Transform almanac into ranges
-    almanac0 = []
-    for page in almanac:
-        almanac0.append([])
-        for entry in page:
-            delta = entry.next - entry.curr
-            almanac0[-1].append((entry.curr, entry.curr + entry.range - 1, delta))
-
-    # Take a sum of the number of seeds we have.  We will uses this to make sure
-    # that we do not lose any seeds along the way.
-    checksum = sum(seed[1] - seed[0] + 1 for seed in seed_ranges)
-    # For every page in the almanac, we will have a current queue and the queue
-    # for the next page of the almanac.
-    currq = collections.deque(seed_ranges)
-    nextq = collections.deque()
-    # For every page compute all the transformations *by range*.
-    for page in almanac0:
-        while currq:
-            # For each range in the queue, see if there is a transformation that
-            # overlaps that range.
-            x1, x2 = currq.popleft()
-            overlap_found = False
-            for y1, y2, d in page:
-                if max(x1,y1) <= min(x2,y2):
-                    # If there is an overlap, compute the range of the overlap
-                    # and any ranges that do not overlap.  Put each of the
-                    # nonoverlapping ranges in the current queue.
-                    overlap_found = True
-                    overlap = (max(x1, y1)+d, min(x2, y2)+d)
-                    nonoverlap_sum = 0
-                    if x1 < y1:
-                        # xxxxx
-                        #   yyyyyy
-                        nonoverlap = (x1, y1-1)
-                        currq.append(nonoverlap)
-                        nonoverlap_sum += (nonoverlap[1] - nonoverlap[0] + 1)
-                    if x2 > y2:
-                        #   xxxx
-                        # yyyy
-                        nonoverlap = (y2+1,x2)
-                        currq.append(nonoverlap)
-                        nonoverlap_sum += (nonoverlap[1] - nonoverlap[0] + 1)
-
-                    # Check to make sure that the ranges we broke into still
-                    # sum to the same number of seeds.
-                    overlap_sum = (overlap[1] - overlap[0] + 1)
-                    range_sum = (x2 - x1 + 1)
-                    assert overlap_sum + nonoverlap_sum == range_sum
-                    # Put the transformed overlap into the queue for the next
-                    # page of the almanac.
-                    nextq.append(overlap)
-                    # Stop looking for a match for this range.
-                    break
-            # If there were no overlapping transformations on this page of the
-            # almanac, put our range in the queue for the next page.
-            if not overlap_found:
-                nextq.append((x1,x2))
-        # Check to make sure the queue for the next page of the almanac still
-        # has the required number of seeds.
-        checksum0 = sum(seed[1] - seed[0] + 1 for seed in nextq)
-        assert checksum0 == checksum
-        currq, nextq = nextq, collections.deque()
-
-    # Return the minimum range start, as that will be the lowest location value.
-    return min(t[0] for t in currq)
+    function = compile_almanac(almanac)
+    # Each piece maps its part of a range onto a range starting at the image
+    # of its first seed, so the lowest location is one of those.
+    return min(
+        lo
+        for start, length in zip(seeds[::2], seeds[1::2])
+        for lo, _ in map_range(function, start, start + length)
+    )
 
 
 def main():
     "Main program"
-    import sys
-    import pyperclip
     with open(sys.argv[1]) as infile:
         lines = [t.strip() for t in infile.readlines()]
     seeds, almanac = parse_input(lines)
@@ -138,7 +192,7 @@ def main():
     assert soln_a == 261668924
     soln_b = solve_b(seeds, almanac)
     print('The lowest location number with ranges is', soln_b)
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
     assert soln_b == 24261545
 
 
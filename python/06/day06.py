@@ -8,8 +8,14 @@ jramaswami
 
 import collections
 import functools
+import math
 import operator
-import tqdm
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import output
 
 
 Race = collections.namedtuple('Race', ['time', 'dist'])
@@ -36,33 +42,117 @@ def get_time_to_complete_race(time_to_hold, record_distance):
     return time_to_hold + time_to_cover_record_distance
 
 
+def wins(race, hold):
+    "Return True if holding the button for hold ms beats the record"
+    return hold * (race.time - hold) > race.dist
+
+
 def compute_race_extrema(race):
-    min_hold = race.time
-    max_hold = 0
-    for t in tqdm.trange(1, race.time):
-        if t + (race.dist / t) < race.time:
-            min_hold = min(min_hold, t)
-            max_hold = max(max_hold, t)
-    return min_hold,max_hold
+    """
+    Return the shortest and longest hold times that beat the record, or
+    (race.time, 0) if none do.
+
+    Holding for t ms wins when t * (time - t) > dist, that is when t lies
+    strictly between the roots of t^2 - time * t + dist = 0.  The lower root
+    is (time - sqrt(disc)) / 2, and with the integer square root the guess
+    below is either the last losing hold time or one past it.  The longest
+    hold time mirrors the shortest one around time / 2.
+    """
+    disc = race.time * race.time - 4 * race.dist
+    if disc <= 0:
+        return race.time, 0
+    lo = (race.time - math.isqrt(disc)) // 2
+    if wins(race, lo):
+        lo -= 1
+    min_hold, max_hold = lo + 1, race.time - lo - 1
+    if min_hold > max_hold:
+        return race.time, 0
+    return min_hold, max_hold
+
+
+def count_ways_to_win(race):
+    min_hold, max_hold = compute_race_extrema(race)
+    return max(0, max_hold - min_hold + 1)
+
+
+def test_compute_race_extrema():
+    assert compute_race_extrema(Race(7, 9)) == (2, 5)
+    assert compute_race_extrema(Race(30, 200)) == (11, 19)
+    # Exact roots do not win: 10 * 10 == 100.
+    assert compute_race_extrema(Race(20, 100)) == (20, 0)
+    assert compute_race_extrema(Race(20, 99)) == (10, 10)
+    for time in range(1, 60):
+        for dist in range(0, time * time // 4 + 2):
+            race = Race(time, dist)
+            winners = [t for t in range(1, time) if wins(race, t)]
+            assert count_ways_to_win(race) == len(winners)
+            if winners:
+                assert compute_race_extrema(race) == (winners[0], winners[-1])
+
+
+def count_ways_to_win_batch(times, dists):
+    """
+    Return a numpy array with the number of winning hold times of each race
+    given by the arrays times and dists.  Each time * time and each dist
+    must fit in an int64.
+
+    This is compute_race_extrema for all the races at once.  The floating
+    point square root may put the guess one off in either direction, so it
+    is nudged down while it wins and up while the next hold time loses.
+    """
+    import numpy as np
+    times = np.asarray(times, dtype=np.int64)
+    # No hold beats a record over time * time / 4, so clamping larger ones
+    # changes nothing and keeps 4 * dists from overflowing.
+    dists = np.minimum(np.asarray(dists, dtype=np.int64), times * times // 4 + 1)
+
+    def batch_wins(hold):
+        return hold * (times - hold) > dists
+
+    disc = np.maximum(times * times - 4 * dists, 0)
+    lo = ((times - np.sqrt(disc)) // 2).astype(np.int64)
+    for _ in range(2):
+        lo -= batch_wins(lo)
+    for _ in range(2):
+        lo += ~batch_wins(lo + 1)
+    return np.maximum(times - 2 * lo - 1, 0)
+
+
+def test_count_ways_to_win_batch():
+    import random
+    rng = random.Random(6)
+    races = [Race(7, 9), Race(15, 40), Race(30, 200), Race(20, 100), Race(3, 2)]
+    for _ in range(2000):
+        time = rng.randint(1, 3 * 10**9)
+        races.append(Race(time, rng.randint(0, time * time // 4 + 10)))
+    # Records too large for 4 * dist to fit in an int64.
+    races.extend([Race(10, 3 * 10**18), Race(3 * 10**9, 2**62), Race(1, 2**63 - 1)])
+    result = count_ways_to_win_batch([r.time for r in races], [r.dist for r in races])
+    assert result.tolist() == [count_ways_to_win(r) for r in races]
 
 
 def solve_a(races):
-    result = []
-    for race in races:
-        min_hold, max_hold = compute_race_extrema(race)
-        result.append((min_hold, max_hold))
-    return functools.reduce(operator.mul, (y - x + 1 for x, y in result), 1)
+    return functools.reduce(operator.mul, (count_ways_to_win(r) for r in races), 1)
+
+
+def test_solve_a():
+    with open('../../data/06/test06a.txt', 'r') as infile:
+        lines = infile.readlines()
+    assert solve_a(parse_input_a(lines)) == 288
 
 
 def solve_b(race):
-    min_hold, max_hold = compute_race_extrema(race)
-    return max_hold - min_hold + 1
+    return count_ways_to_win(race)
+
+
+def test_solve_b():
+    with open('../../data/06/test06a.txt', 'r') as infile:
+        lines = infile.readlines()
+    assert solve_b(parse_input_b(lines)) == 71503
 
 
 def main():
     "Main program."
-    import sys
-    import pyperclip
     lines = sys.stdin.readlines()
     races = parse_input_a(lines)
     soln_a = solve_a(races)
@@ -72,7 +162,7 @@ def main():
     soln_b = solve_b(race)
     assert soln_b == 43663323
     print('The solution to the first part of day 6 is', soln_b)
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
@@ -6,9 +6,17 @@ jramaswami
 """
 
 
+import array
 import collections
 import enum
 import functools
+import operator
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import output
 
 
 CARD_ORDER = 'AKQJT98765432'[::-1]
@@ -25,30 +33,63 @@ class HandType(enum.IntEnum):
     FiveOfAKind = 7,
 
 
+# Hand type by the card counts of the hand, largest first.
+HAND_TYPES = {
+    (5,): HandType.FiveOfAKind,
+    (4, 1): HandType.FourOfAKind,
+    (3, 2): HandType.FullHouse,
+    (3, 1, 1): HandType.ThreeOfAKind,
+    (2, 2, 1): HandType.TwoPair,
+    (2, 1, 1, 1): HandType.OnePair,
+    (1, 1, 1, 1, 1): HandType.HighCard,
+}
+
+
+def card_counts(cards):
+    "Return the counts of each card in cards, largest first."
+    return sorted(collections.Counter(cards).values(), reverse=True)
+
+
 def compute_hand_type_with_jokers(cards):
-    best_hand_type = HandType.HighCard
-    for joker_becomes in CARD_ORDER_WITH_JOKERS:
-        cards0 = cards.replace('J', joker_becomes)
-        best_hand_type = max(best_hand_type, compute_hand_type(cards0))
-    return best_hand_type
+    # The best a joker can do is to copy the most common other card: that
+    # always makes the largest group as large as possible, and no hand type
+    # is helped by making two groups instead.
+    jokers = cards.count('J')
+    counts = card_counts(cards.replace('J', '')) or [0]
+    counts[0] += jokers
+    return HAND_TYPES[tuple(counts)]
 
 
 def compute_hand_type(cards):
-    card_freqs = collections.Counter(cards)
-    freq_freqs = collections.Counter(card_freqs.values())
-    if freq_freqs[5] > 0:
-        return HandType.FiveOfAKind
-    elif freq_freqs[4] > 0:
-        return HandType.FourOfAKind
-    elif freq_freqs[3] > 0 and freq_freqs[2] > 0:
-        return HandType.FullHouse
-    elif freq_freqs[3] > 0:
-        return HandType.ThreeOfAKind
-    elif freq_freqs[2] > 1:
-        return HandType.TwoPair
-    elif freq_freqs[2] > 0:
-        return HandType.OnePair
-    return HandType.HighCard
+    return HAND_TYPES[tuple(card_counts(cards))]
+
+
+def hand_key(cards, with_jokers=False):
+    """
+    Return an integer that sorts hands into order of strength: the hand type
+    followed by a four bit rank for each card.
+    """
+    if with_jokers:
+        key = compute_hand_type_with_jokers(cards)
+        card_order = CARD_ORDER_WITH_JOKERS
+    else:
+        key = compute_hand_type(cards)
+        card_order = CARD_ORDER
+    for card in cards:
+        key = (key << 4) | card_order.index(card)
+    return key
+
+
+def test_hand_key():
+    assert hand_key('23456') == (1 << 20) | 0x01234
+    assert hand_key('JJJJJ', True) == 7 << 20
+    assert hand_key('AAAAA') == (7 << 20) | 0xCCCCC
+    assert hand_key('QJJQ2', True) > hand_key('QJJQ2')
+    for cards in ['32T3K', 'T55J5', 'KK677', 'KTJJT', 'QQQJA', 'JJJJ2', '2345J']:
+        # The closed form agrees with trying every card for the jokers.
+        assert hand_key(cards, True) >> 20 == max(
+            compute_hand_type(cards.replace('J', c)) for c in CARD_ORDER_WITH_JOKERS
+        )
 
 
 def test_compute_hand_type():
@@ -74,35 +115,22 @@ def test_compute_hand_type_with_jokers():
 class Hand:
     def __init__(self, cards, bid=0, with_jokers=False):
         self.cards = cards
-        if with_jokers:
-            self.hand_type = compute_hand_type_with_jokers(cards)
-        else:
-            self.hand_type = compute_hand_type(cards)
-
         self.bid = bid
-        card_order = CARD_ORDER
-        if with_jokers:
-            card_order = CARD_ORDER_WITH_JOKERS
-        self.values = [card_order.find(c) for c in self.cards]
         self.with_jokers = with_jokers
+        self.key = hand_key(cards, with_jokers)
+
+    @property
+    def hand_type(self):
+        return HandType(self.key >> 20)
 
     def __eq__(self, other):
         return self.cards == other.cards
 
     def __lt__(self, other):
-        if self.hand_type < other.hand_type:
-            return True
-        if self.hand_type == other.hand_type:
-            for a, b in zip(self.values, other.values):
-                if a < b:
-                    return True
-                if a > b:
-                    return False
-
-        return False
+        return self.key < other.key
 
     def __repr__(self):
-        return f'Hand({self.cards}, {self.bid}, {self.with_jokers}, {self.hand_type.name} {self.values})'
+        return f'Hand({self.cards}, {self.bid}, {self.with_jokers}, {self.hand_type.name} {self.key:#x})'
 
 
 def test_rank_hand():
@@ -132,11 +160,8 @@ def test_sorting():
 
 
 def solve(hands):
-    soln = 0
-    hands.sort()
-    for i, h in enumerate(hands, start=1):
-        soln += (i * h.bid)
-    return soln
+    hands.sort(key=operator.attrgetter('key'))
+    return sum(i * h.bid for i, h in enumerate(hands, start=1))
 
 
 def test_solve():
@@ -146,28 +171,57 @@ def test_solve():
     assert solve(hands_with_jokers) == 5905
 
 
+# The hands as parallel columns: the key of each hand, the key of each hand
+# with jokers wild and the bid on each hand.  A key fits in 23 bits.
+Hands = collections.namedtuple('Hands', ['keys', 'joker_keys', 'bids'])
+
+
 def parse_input(lines):
-    hands = []
+    "Parse the lines, which may be any iterable, into Hands"
+    keys, joker_keys, bids = array.array('i'), array.array('i'), array.array('q')
     for line in lines:
         cards, bid = line.split()
-        hands.append(Hand(cards.strip(), int(bid.strip())))
-    return hands
+        keys.append(hand_key(cards))
+        joker_keys.append(hand_key(cards, True))
+        bids.append(int(bid))
+    return Hands(keys, joker_keys, bids)
+
+
+def total_winnings(keys, bids):
+    "Return the total winnings of the hands with the given keys and bids."
+    import numpy as np
+    order = np.argsort(np.frombuffer(keys, dtype=np.int32), kind='stable')
+    ranks = np.arange(1, len(order) + 1, dtype=np.int64)
+    return int((ranks * np.frombuffer(bids, dtype=np.int64)[order]).sum())
+
+
+def solve_a(hands):
+    return total_winnings(hands.keys, hands.bids)
+
+
+def solve_b(hands):
+    return total_winnings(hands.joker_keys, hands.bids)
+
+
+def test_solve_hands():
+    with open('../../data/07/test07a.txt', 'r') as infile:
+        hands = parse_input(infile)
+    assert list(hands.bids) == [765, 684, 28, 220, 483]
+    assert solve_a(hands) == 6440
+    assert solve_b(hands) == 5905
+    assert solve_a(parse_input([])) == 0
 
 
 def main():
     "Main program"
-    import sys
-    import pyperclip
-    lines = sys.stdin.readlines()
-    hands = parse_input(lines)
-    soln_a = solve(hands)
+    hands = parse_input(sys.stdin)
+    soln_a = solve_a(hands)
     print('The total winnings are', soln_a)
     assert soln_a == 251058093
-    hands_with_jokers = [Hand(h.cards, h.bid, True) for h in hands]
-    soln_b = solve(hands_with_jokers)
+    soln_b = solve_b(hands)
     print('The total winnings with wild jokers are', soln_b)
     assert soln_b == 249781879
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
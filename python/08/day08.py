@@ -7,7 +7,14 @@ jramaswami
 
 
 import collections
+import concurrent.futures
 import math
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import output
 
 
 Neighbors = collections.namedtuple('Neighbors', ['left', 'right'])
@@ -27,19 +34,146 @@ def parse_input(lines):
     return instructions, graph
 
 
+# The graph compiled for one set of target nodes.  Nodes are numbered in ids
+# and moves[i][u] is where step i of the instructions takes node u.  A pass
+# is one run through all the instructions: passes[u] is where a pass from u
+# ends and hits[u] the steps into that pass at which it is on a target.
+Compiled = collections.namedtuple('Compiled', ['ids', 'moves', 'passes', 'hits'])
+
+
+def compile_passes(moves, targets, nodes):
+    "Return the passes and hits, as in Compiled, of the nodes in the range nodes."
+    passes, hits = [], []
+    for u in nodes:
+        curr = u
+        node_hits = []
+        for k, move in enumerate(moves):
+            if targets[curr]:
+                node_hits.append(k)
+            curr = move[curr]
+        passes.append(curr)
+        hits.append(tuple(node_hits))
+    return passes, hits
+
+
+def compile_graph(instructions, graph, ends, workers=1):
+    """
+    Compile graph for instructions with the targets being the nodes ending
+    in ends.  With more than one worker, the passes of chunks of the nodes
+    are followed in a pool of that many processes.
+    """
+    ids = {name: u for u, name in enumerate(graph)}
+    left = [ids[graph[name].left] for name in graph]
+    right = [ids[graph[name].right] for name in graph]
+    moves = [left if i == 'L' else right for i in instructions]
+    targets = [name.endswith(ends) for name in graph]
+    if workers > 1 and len(ids) > 1:
+        size = -(-len(ids) // workers)
+        chunks = [range(i, min(i + size, len(ids))) for i in range(0, len(ids), size)]
+        passes, hits = [], []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_passes, chunk_hits in executor.map(
+                compile_passes, [moves] * len(chunks), [targets] * len(chunks), chunks
+            ):
+                passes.extend(chunk_passes)
+                hits.extend(chunk_hits)
+    else:
+        passes, hits = compile_passes(moves, targets, range(len(ids)))
+    return Compiled(ids, moves, passes, hits)
+
+
+def node_after(compiled, start, steps):
+    "Return the node that steps steps from start ends on."
+    passes, rest = divmod(steps, len(compiled.moves))
+    curr = start
+    # jump[u] is where 2**j passes from u end, doubled only as far as the
+    # bits of passes need.
+    jump = compiled.passes
+    while passes:
+        if passes & 1:
+            curr = jump[curr]
+        passes >>= 1
+        if passes:
+            jump = [jump[v] for v in jump]
+    for move in compiled.moves[:rest]:
+        curr = move[curr]
+    return curr
+
+
+# The steps at which one walk is on a target.  It reaches a pass it has
+# started before after start steps and repeats every period steps after that.
+# The hits before then are in transient and the hits from then on are offsets
+# plus any multiple of period.
+Cycle = collections.namedtuple('Cycle', ['transient', 'start', 'period', 'offsets'])
+
+
+def find_cycle(compiled, start):
+    "Return the Cycle of the walk from start."
+    seen = {}
+    boundaries = []
+    curr = start
+    while curr not in seen:
+        seen[curr] = len(boundaries)
+        boundaries.append(curr)
+        curr = compiled.passes[curr]
+    length = len(compiled.moves)
+    cycle_start = seen[curr] * length
+    times = [p * length + k for p, u in enumerate(boundaries) for k in compiled.hits[u]]
+    return Cycle(
+        tuple(t for t in times if t < cycle_start),
+        cycle_start,
+        (len(boundaries) - seen[curr]) * length,
+        tuple(t for t in times if t >= cycle_start),
+    )
+
+
+def is_hit(cycle, t):
+    "Return True if the walk of cycle is on a target after t steps."
+    if t < cycle.start:
+        return t in cycle.transient
+    return cycle.start + (t - cycle.start) % cycle.period in cycle.offsets
+
+
+def crt(r1, m1, r2, m2):
+    """
+    Return r such that t == r (mod lcm(m1, m2)) exactly when t == r1 (mod m1)
+    and t == r2 (mod m2), or None if there is no such t.
+    """
+    g = math.gcd(m1, m2)
+    if (r2 - r1) % g:
+        return None
+    k = (r2 - r1) // g * pow(m1 // g, -1, m2 // g) % (m2 // g)
+    return (r1 + m1 * k) % (m1 // g * m2)
+
+
+def first_common_hit(cycles):
+    "Return the fewest steps after which every walk is on a target, or None."
+    # A hit before some walk is in its cycle is one of that walk's transient
+    # hits.
+    candidates = [
+        t for cycle in cycles for t in cycle.transient
+        if all(is_hit(other, t) for other in cycles)
+    ]
+    # After that every walk is in its cycle, and each choice of an offset for
+    # every walk gives a residue modulo the lcm of the periods.
+    residues, modulus = {0}, 1
+    for cycle in cycles:
+        residues = {
+            r for r in (
+                crt(residue, modulus, offset % cycle.period, cycle.period)
+                for residue in residues for offset in cycle.offsets
+            )
+            if r is not None
+        }
+        modulus = math.lcm(modulus, cycle.period)
+    start = max(cycle.start for cycle in cycles)
+    candidates.extend(start + (r - start) % modulus for r in residues)
+    return min(candidates, default=None)
+
+
 def solve_a(instructions, graph):
-    curr = 'AAA'
-    steps = 0
-    i = 0
-    while curr != 'ZZZ':
-        steps += 1
-        if instructions[i] == 'L':
-            curr = graph[curr].left
-        else:
-            curr = graph[curr].right
-        i += 1
-        i %= len(instructions)
-    return steps
+    compiled = compile_graph(instructions, graph, 'ZZZ')
+    return first_common_hit([find_cycle(compiled, compiled.ids['AAA'])])
 
 
 def test_solve_a_rs():
@@ -58,25 +192,13 @@ def test_solve_a_llr():
     assert result == 6
 
 
-def solve_b(instructions, graph):
-    def steps_to_end_with_z(curr):
-        steps = 0
-        i = 0
-        while not curr.endswith('Z'):
-            steps += 1
-            if instructions[i] == 'L':
-                curr = graph[curr].left
-            else:
-                curr = graph[curr].right
-            i += 1
-            i %= len(instructions)
-        return steps
-
+def solve_b(instructions, graph, workers=1):
+    "Solve part two, compiling the graph with workers processes."
+    compiled = compile_graph(instructions, graph, 'Z', workers)
     # Find all nodes that end in 'A'
-    roots = [n for n in graph if n.endswith('A')]
-    steps = [steps_to_end_with_z(n) for n in roots]
-    soln = math.lcm(*steps)
-    return soln
+    roots = [u for n, u in compiled.ids.items() if n.endswith('A')]
+    # Following each walk until it repeats is cheap once the graph is compiled.
+    return first_common_hit([find_cycle(compiled, u) for u in roots])
 
 
 def test_solve_b_():
@@ -85,12 +207,55 @@ def test_solve_b_():
     instructions, graph = parse_input(lines)
     result = solve_b(instructions, graph)
     assert result == 6
+    assert solve_b(instructions, graph, workers=2) == 6
+
+
+def test_solve_b_without_lcm():
+    # 11A is on a Z at steps 2, 4, 6, ... and 22A at steps 1, 4, 7, ...  so
+    # the lcm of the first hits, 2, is not the answer.
+    lines = [
+        'L', '',
+        '11A = (11B, 11B)', '11B = (11Z, 11Z)', '11Z = (11B, 11B)',
+        '22A = (22Z, 22Z)', '22Z = (22B, 22B)', '22B = (22C, 22C)', '22C = (22Z, 22Z)',
+        'XXX = (XXX, XXX)',
+    ]
+    instructions, graph = parse_input(lines)
+    assert solve_b(instructions, graph) == 4
+    lines[-1] = '33A = (XXX, XXX)'
+    lines.append('XXX = (XXX, XXX)')
+    instructions, graph = parse_input(lines)
+    assert solve_b(instructions, graph) is None
+
+
+def test_node_after():
+    with open('../../data/08/test08LR.txt', 'r') as infile:
+        lines = infile.readlines()
+    instructions, graph = parse_input(lines)
+    compiled = compile_graph(instructions, graph, 'Z')
+    assert compile_graph(instructions, graph, 'Z', workers=3) == compiled
+    for start in compiled.ids.values():
+        curr = start
+        for steps in range(50):
+            assert node_after(compiled, start, steps) == curr
+            curr = compiled.moves[steps % len(instructions)][curr]
+        cycle = find_cycle(compiled, start)
+        # Far beyond 2**48 passes, which the cycle brings back to a few.
+        mu, lam = cycle.start // len(instructions), cycle.period // len(instructions)
+        passes = 3 ** 40
+        near = mu + (passes - mu) % lam
+        assert node_after(compiled, start, passes * len(instructions) + 1) == (
+            node_after(compiled, start, near * len(instructions) + 1)
+        )
+        names = list(compiled.ids)
+        for steps in range(50):
+            on_z = names[node_after(compiled, start, steps)].endswith('Z')
+            assert is_hit(cycle, steps) == on_z
+    assert crt(2, 4, 3, 6) is None
+    assert crt(1, 4, 3, 6) == 9
 
 
 def main():
     "Main program"
-    import pyperclip
-    import sys
     with open('../../data/08/input08.txt', 'r') as infile:
         lines = infile.readlines()
     instructions, graph = parse_input(lines)
@@ -104,7 +269,7 @@ def main():
         'steps to reach all nodes ending in Z'
     )
     assert soln_b == 16342438708751
-    pyperclip.copy(soln_b)
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
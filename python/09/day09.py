@@ -6,41 +6,70 @@ jramaswami
 """
 
 
+import collections
+import functools
+import math
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import loader
+from aoc import output
+
+
+@functools.cache
+def extrapolation_weights(n):
+    """
+    Return the weights, as tuples of Python integers, that give the next and
+    the previous value of a sequence of length n from its values.
+
+    Extending every row of differences until the last row is constant is
+    extending the polynomial of degree less than n through the sequence.
+    By Newton's forward difference formula that gives
+        next = sum((-1)**(n-1-i) * C(n, i) * x[i])
+        previous = sum((-1)**i * C(n, i+1) * x[i])
+    """
+    next_weights = tuple((-1) ** (n - 1 - i) * math.comb(n, i) for i in range(n))
+    previous_weights = tuple((-1) ** i * math.comb(n, i + 1) for i in range(n))
+    return next_weights, previous_weights
+
+
+def extrapolate_batch(sequences):
+    """
+    Return a (len(sequences), 2) array of the next and previous values of
+    equal length sequences.
+    """
+    import numpy as np
+    n = len(sequences[0])
+    # Both sets of weights add up to 2**n - 1 in absolute value, so no value,
+    # and no sum of a column of them, can be larger than this.  Counting the
+    # largest value as at least 1 also bounds the weights themselves.
+    largest = max(1, max(abs(x) for seq in sequences for x in seq))
+    bound = largest * 2 ** n * len(sequences)
+    # Otherwise int64 would overflow, so use Python integers.
+    dtype = np.int64 if bound < 2 ** 63 else object
+    values = np.array(sequences, dtype=dtype)
+    weights = np.array(extrapolation_weights(n), dtype=dtype)
+    return values @ weights.T
+
+
 def extrapolate_value(sequence):
-    rows = [[]]
-    for i, _ in enumerate(sequence[:-1]):
-        d = sequence[i+1] - sequence[i]
-        rows[0].append(d)
-        for r, row in enumerate(rows):
-            if len(row) >= 2:
-                d = row[-1] - row[-2]
-                if r + 1 >= len(rows):
-                    rows.append([])
-                rows[r+1].append(d)
-    rows.append([0 for _ in rows[-1]])
-
-    for r in range(len(rows)-1, 0, -1):
-        rows[r-1].append(rows[r-1][-1] + rows[r][-1])
-    soln_a = sequence[-1] + rows[0][-1]
-
-    # sequence0 = list(sequence)
-    # sequence0.append(sequence[-1] + rows[0][-1])
-    # print('*' * 60)
-    # print(sequence0)
-    # for row in rows:
-    #     print(row)
-
-    # z   y
-    #   x
-    # y - z = x
-    # -z = x - y
-    # z = y - x
-    reverse_values = [0]
-    for r in range(len(rows)-1, -1, -1):
-        reverse_values.append(rows[r][0] - reverse_values[-1])
-    soln_b = sequence[0] - reverse_values[-1]
-
-    return soln_a, soln_b
+    soln_a, soln_b = extrapolate_batch([sequence])[0]
+    return int(soln_a), int(soln_b)
+
+
+def extrapolate_totals(sequences):
+    "Return the sums of the next and of the previous values of sequences."
+    by_length = collections.defaultdict(list)
+    for seq in sequences:
+        by_length[len(seq)].append(seq)
+    total_a, total_b = 0, 0
+    for batch in by_length.values():
+        values = extrapolate_batch(batch)
+        total_a += int(values[:, 0].sum())
+        total_b += int(values[:, 1].sum())
+    return total_a, total_b
 
 
 def test_extrapolate():
@@ -48,10 +77,44 @@ def test_extrapolate():
     sequences = [[int(n) for n in inp.split()] for inp in inputs]
     expected = [18, 28, 68]
     assert [extrapolate_value(seq)[0] for seq in sequences] == expected
+    assert [extrapolate_value(seq)[1] for seq in sequences] == [-3, 0, 5]
+    assert extrapolate_value([7]) == (7, 7)
+    # Values too large for int64 products are still exact.
+    big = [10 ** 17 * i * i for i in range(6)]
+    assert extrapolate_value(big) == (10 ** 17 * 36, 10 ** 17)
+
+
+def extrapolate_by_differences(sequence):
+    "Return the next and previous values by building every row of differences."
+    rows = [list(sequence)]
+    while any(rows[-1]):
+        rows.append([b - a for a, b in zip(rows[-1], rows[-1][1:])])
+    next_value, previous_value = 0, 0
+    for row in reversed(rows):
+        next_value = row[-1] + next_value if row else next_value
+        previous_value = row[0] - previous_value if row else previous_value
+    return next_value, previous_value
+
+
+def test_extrapolate_long():
+    # The weights of long sequences no longer fit in int64.
+    for n in (20, 63, 64, 66, 67, 100):
+        sequences = [[i ** 5 - 3 * i + k for i in range(n)] for k in range(3)]
+        sequences.append([(-1) ** i * (i % 7) for i in range(n)])
+        sequences.append([0] * n)
+        expected = [extrapolate_by_differences(seq) for seq in sequences]
+        assert [extrapolate_value(seq) for seq in sequences] == expected
+        assert extrapolate_totals(sequences) == tuple(map(sum, zip(*expected)))
+
+
+def test_extrapolate_totals():
+    sequences = [[0, 3, 6, 9, 12, 15], [1, 3, 6, 10, 15, 21], [10, 13, 16, 21, 30, 45], [2, 4]]
+    assert extrapolate_totals(sequences) == (114 + 6, 2 + 0)
+    assert extrapolate_totals([]) == (0, 0)
 
 
 def solve_a(sequences):
-    return sum(extrapolate_value(seq)[0] for seq in sequences)
+    return extrapolate_totals(sequences)[0]
 
 
 def test_solve_a():
@@ -61,7 +124,7 @@ def test_solve_a():
 
 
 def solve_b(sequences):
-    return sum(extrapolate_value(seq)[1] for seq in sequences)
+    return extrapolate_totals(sequences)[1]
 
 
 def test_solve_b():
@@ -72,16 +135,14 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
-    with open('../../data/09/input09.txt', 'r') as infile:
-        sequences = [[int(n) for n in t.strip().split()] for t in infile.readlines()]
-    soln_a = solve_a(sequences)
+    lines = loader.iter_lines('../../data/09/input09.txt')
+    sequences = [[int(n) for n in t.split()] for t in lines]
+    soln_a, soln_b = extrapolate_totals(sequences)
     print('The sum of the extrapolated values is', soln_a)
     assert soln_a == 2038472161
-    soln_b = solve_b(sequences)
     print('The sum of the reverse extrapolated values is', soln_b)
     assert soln_b == 1091
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
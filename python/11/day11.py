@@ -6,50 +6,51 @@ jramaswami
 """
 
 
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import grid as aocgrid
+from aoc import output
+
+
 def read_input(path):
-    with open(path,'r') as infile:
-        grid = [line.strip() for line in infile.readlines()]
-    return grid
+    return aocgrid.Grid.read(path)
+
+
+def pair_sum(xs):
+    "Return the sum of |a - b| over all pairs of the sorted array xs."
+    # xs[i] is larger than the i values before it and smaller than the
+    # n - 1 - i values after it.
+    n = len(xs)
+    return int((xs * (2 * np.arange(n, dtype=np.int64) - n + 1)).sum())
+
+
+def pair_distance_sums(grid, expansions):
+    """
+    Return the sum of the distances between all pairs of galaxies for each
+    of expansions, the number of rows or columns every empty row or column
+    becomes.
+    """
+    galaxies = grid.mask('#')
+    rows, cols = np.nonzero(galaxies)
+    cols = np.sort(cols)
+    # The number of empty rows (columns) before each row (column).  Galaxy
+    # rows are not empty, so the count up to a galaxy row is the count before.
+    empty_rows = np.cumsum(~galaxies.any(axis=1))
+    empty_cols = np.cumsum(~galaxies.any(axis=0))
+    # An expanded coordinate is x + (expansion - 1) * empty[x] and both terms
+    # grow with x, so the distance sum is linear in the expansion.
+    distance = pair_sum(rows) + pair_sum(cols)
+    empties = pair_sum(empty_rows[rows]) + pair_sum(empty_cols[cols])
+    return [distance + (expansion - 1) * empties for expansion in expansions]
 
 
 def solve(grid, expansion=2):
-    soln_a = 0
-
-    # Find location of all galaxies
-    galaxies = []
-    for r, row in enumerate(grid):
-        for c, val in enumerate(row):
-            if val == '#':
-                galaxies.append((r, c))
-
-    # Find empty rows/cols
-    empty_rows = []
-    for r, row in enumerate(grid):
-        if all(t == '.' for t in row):
-            empty_rows.append(r)
-
-    empty_cols = []
-    for c, _ in enumerate(grid[0]):
-        if all(row[c] == '.' for row in grid):
-            empty_cols.append(c)
-
-    # For each pair of galaxies
-    pairs = 0
-    for i, g1 in enumerate(galaxies):
-        for j, g2 in enumerate(galaxies[i+1:], start=i+1):
-            pairs += 1
-            dist = 0
-            r1, r2 = min(g1[0], g2[0]), max(g1[0], g2[0])
-            dist += r2 - r1
-            ers = sum(expansion - 1 for er in empty_rows if r1 <= er <= r2)
-            dist += ers
-            # Compute how many empty cols are crossed and add them distance.
-            c1, c2 = min(g1[1], g2[1]), max(g1[1], g2[1])
-            dist += c2 - c1
-            ecs = sum(expansion - 1 for ec in empty_cols if c1 <= ec <= c2)
-            dist += ecs
-            soln_a += dist
-    return soln_a
+    return pair_distance_sums(grid, [expansion])[0]
 
 
 def test_solve():
@@ -63,18 +64,18 @@ def test_solve():
     soln_a = solve(grid, 100)
     assert soln_a == 8410
 
+    assert pair_distance_sums(grid, [2, 10, 100]) == [374, 1030, 8410]
+
 
 def main():
     "Main program"
-    import pyperclip
     grid = read_input('../../data/11/input11.txt')
-    soln_a = solve(grid)
+    soln_a, soln_b = pair_distance_sums(grid, [2, 1000000])
     print('The sum of the lengths is', soln_a)
     assert soln_a == 9648398
-    pyperclip.copy(str(soln_a))
-    soln_b = solve(grid, 1000000)
+    output.copy(soln_a)
     print('The sum of the lengths with expansion', 1000000, 'is', soln_b)
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
@@ -6,97 +6,128 @@ jramaswami
 """
 
 
-import functools
+import collections
+import concurrent.futures
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import loader
+from aoc import output
 
 
 def read_input(path):
     records = []
-    with open(path, 'r') as infile:
-        for line in infile:
-            line = line.strip()
-            grid, rle = (t.strip() for t in line.split())
-            rle = tuple(int(t) for t in rle.split(','))
-            records.append((grid, rle))
+    for line in loader.iter_lines(path):
+        grid, rle = (t.strip() for t in line.split())
+        rle = tuple(int(t) for t in rle.split(','))
+        records.append((grid, rle))
     return records
 
 
-def count_arrangements_rec(grid, rle):
-
-    @functools.cache
-    def can_start_run(g, r):
-        # There must be some rle's left
-        if r >= len(rle):
-            return False
-        rl = rle[r]
-        # The run must fit inside the grid
-        if g+rl > len(grid):
-            return False
-        # All the chars in the grid must be # or ?
-        if any(c == '.' for c in grid[g:g+rl]):
-            return False
-        return True
-
-    @functools.cache
-    def starting(g, r):
-        # Base case: done with grid.
-        if g >= len(grid):
-            # If done with rle too, then we have found an arrangement.
-            if r >= len(rle):
-                return 1
-            return 0
-
-        # Recur.
-        if grid[g] == '.':
-            # I must move forward.
-            return starting(g+1, r)
-        elif grid[g] == '?':
-            result = 0
-            # I can start an rle here
-            if can_start_run(g, r):
-                result += finishing(g+rle[r], r+1)
-            # I can just move forward
-            result += starting(g+1, r)
-            return result
-        elif grid[g] == '#':
-            # I must start an rle here
-            if can_start_run(g, r):
-                return finishing(g+rle[r], r+1)
-            return 0
-
-    @functools.cache
-    def finishing(g, r):
-        # Base case: done with grid.
-        if g >= len(grid):
-            # If done with rle too, then we have found an arrangement.
-            if r >= len(rle):
-                return 1
-            return 0
-
-        # The next cell cannot be a #
-        if grid[g] == '#':
-            return 0
-        return starting(g+1, r)
-
-    return starting(0, 0)
+def count_arrangements(grid, rle):
+    """
+    Return the number of ways to place the runs of damaged springs in rle on
+    grid.
+
+    ways[g] is the number of ways to place the runs from r onwards on
+    grid[g:], with a run allowed to start at g.  The rows for r are filled in
+    from the last run back to the first, and each only needs the row for
+    r + 1, so only two rows are kept.  Index n + 1 stands for just after a
+    run that ends at the end of the grid.
+    """
+    n = len(grid)
+    # next_dot[g] is the position of the first '.' at or after g, so a run
+    # of length l fits at g exactly when next_dot[g] >= g + l.
+    next_dot = [n] * (n + 1)
+    for g in range(n - 1, -1, -1):
+        next_dot[g] = g if grid[g] == '.' else next_dot[g+1]
+
+    # With no runs left to place, there is one way if no '#' is left.
+    ways = [0] * (n + 2)
+    ways[n] = ways[n+1] = 1
+    for g in range(n - 1, -1, -1):
+        ways[g] = ways[g+1] if grid[g] != '#' else 0
+
+    next_ways = [0] * (n + 2)
+    for rl in reversed(rle):
+        next_ways, ways = ways, next_ways
+        ways[n] = ways[n+1] = 0
+        for g in range(n - 1, -1, -1):
+            # Leave g undamaged.
+            result = ways[g+1] if grid[g] != '#' else 0
+            # Start a run at g, which must then be followed by an undamaged
+            # spring or the end of the grid.
+            end = g + rl
+            if next_dot[g] >= end and (end == n or grid[end] != '#'):
+                result += next_ways[end+1]
+            ways[g] = result
+    return ways[0]
+
+
+def unfold(record, factor=5):
+    "Return the record unfolded factor times."
+    grid, rle = record
+    return '?'.join(grid for _ in range(factor)), rle * factor
 
 
 def test_count_arrangments_rec():
     records = read_input('../../data/12/test12a.txt')
     expected = [1,4,1,1,4,10]
-    result = [count_arrangements_rec(*r) for r in records]
+    result = [count_arrangements(*r) for r in records]
     assert result == expected
 
-    records0 = []
-    for grid, rle in records:
-        grid0 = '?'.join(grid for _ in range(5))
-        records0.append((grid0, rle*5))
+    records0 = [unfold(r) for r in records]
     expected = [1,16384,1,16,2500,506250]
-    result = [count_arrangements_rec(*r) for r in records0]
+    result = [count_arrangements(*r) for r in records0]
     assert result == expected
 
+    assert count_arrangements(*unfold(records[0], 50)) == 1
+    assert count_arrangements('', ()) == 1
+    assert count_arrangements('#', ()) == 0
+    assert count_arrangements('##', (1,)) == 0
+
+
+def normalize(record):
+    """
+    Return an equivalent record with no leading, trailing or repeated '.',
+    so that records differing only in those share a count.
+    """
+    grid, rle = record
+    return '.'.join(t for t in grid.split('.') if t), rle
+
+
+def count_chunk(chunk):
+    "Return the total count of a list of (normalized record, multiplicity)."
+    return sum(m * count_arrangements(*record) for record, m in chunk)
+
+
+def count_records(records, workers=1, chunksize=64):
+    """
+    Return the total count of arrangements of records, which may be any
+    iterable.  Each distinct record is counted once.  With more than one
+    worker, chunks of distinct records are counted in a pool of that many
+    processes.
+    """
+    distinct = list(collections.Counter(normalize(r) for r in records).items())
+    chunks = [distinct[i:i+chunksize] for i in range(0, len(distinct), chunksize)]
+    if workers > 1 and len(chunks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return sum(executor.map(count_chunk, chunks))
+    return sum(count_chunk(chunk) for chunk in chunks)
+
+
+def test_count_records():
+    records = [('.#..#.', (1, 1)), ('#.#', (1, 1)), ('?#?', (2,)), ('#.#', (1, 1))]
+    assert normalize(records[0]) == records[1]
+    assert count_records(records) == 1 + 1 + 2 + 1
+    assert count_records(records, workers=2, chunksize=1) == 5
+    assert count_records([]) == 0
+
 
-def solve_a(records):
-    return sum(count_arrangements_rec(*r) for r in records)
+def solve_a(records, workers=1):
+    return count_records(records, workers)
 
 
 def test_solve_a():
@@ -106,12 +137,8 @@ def test_solve_a():
     assert result == expected
 
 
-def solve_b(records):
-    records0 = []
-    for grid, rle in records:
-        grid0 = '?'.join(grid for _ in range(5))
-        records0.append((grid0, rle*5))
-    return solve_a(records0)
+def solve_b(records, workers=1):
+    return count_records((unfold(r) for r in records), workers)
 
 
 def test_solve_b():
@@ -123,15 +150,14 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
     records = read_input('../../data/12/input12.txt')
-    soln_a = solve_a(records)
+    soln_a = solve_a(records, os.cpu_count())
     print('The sum of the counts is', soln_a)
     assert soln_a == 6488
-    soln_b = solve_b(records)
+    soln_b = solve_b(records, os.cpu_count())
     print('The new sum of possible arrangement counts is', soln_b)
     assert soln_b == 815364548481
-    pyperclip.copy(soln_b)
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
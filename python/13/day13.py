@@ -6,91 +6,96 @@ jramaswami
 """
 
 
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import loader
+from aoc import output
+
+
+def iter_patterns(path):
+    "Yield the patterns in the file at path one at a time, as tuples of rows"
+    pattern = []
+    for line in loader.iter_lines(path):
+        if line:
+            pattern.append(line)
+        elif pattern:
+            yield tuple(pattern)
+            pattern = []
+    if pattern:
+        yield tuple(pattern)
+
+
 def read_input(path):
-    grids = []
-    with open(path, 'r') as infile:
-        curr_grid = []
-        for line in infile:
-            line = line.strip()
-            if line:
-                curr_grid.append(line)
-            else:
-                grids.append(curr_grid)
-                curr_grid = []
-        grids.append(curr_grid)
-    return grids
+    return list(iter_patterns(path))
 
 
 def test_read_input():
     grids = read_input('../../data/13/test13a.txt')
     assert len(grids) == 2
+    assert [len(g) for g in grids] == [7, 7]
+    assert all(len(row) == 9 for g in grids for row in g)
 
 
-def has_mirror_at(c, row):
-    """
-    Return True if row has mirror in position p where p is the
-    first postion of the reflection.
-    """
-    image = row[:c]
-    reflection = row[c:]
-    return all(a == b for a, b in zip(reflection, reversed(image)))
+def row_masks(grid):
+    "Return each row of grid as an integer with bit c set for a '#' in column c."
+    return [sum(1 << c for c, val in enumerate(row) if val == '#') for row in grid]
 
 
-def test_has_mirror_at():
-    row = '#.##..##.'
-    assert has_mirror_at(5, row)
-    assert not has_mirror_at(4, row)
-    col = '##.##.#'
-    assert has_mirror_at(4, col)
-    assert not has_mirror_at(5, col)
+def column_masks(grid):
+    "Return each column of grid as an integer with bit r set for a '#' in row r."
+    return row_masks(zip(*grid))
 
 
-def rotate_grid(grid):
-    grid_t = []
-    for c, _ in enumerate(grid[0]):
-        row_t = []
-        for r, _ in enumerate(grid):
-            row_t.append(grid[r][c])
-        grid_t.append(''.join(row_t))
-    return grid_t
+def pattern_masks(pattern):
+    "Return the row masks and the column masks of pattern."
+    return row_masks(pattern), column_masks(pattern)
 
 
-def test_rotate_grid():
-    grid = ['#.', '#.']
-    expected = ['##', '..']
-    grid_t = rotate_grid(grid)
-    assert grid_t == expected
+def find_reflection(masks, smudges=0):
+    """
+    Return the number of lines before the line of reflection of masks at
+    which exactly smudges cells differ from their reflections, or 0 if
+    there is none.
+    """
+    for k in range(1, len(masks)):
+        differences = 0
+        for i in range(min(k, len(masks) - k)):
+            differences += (masks[k-1-i] ^ masks[k+i]).bit_count()
+            if differences > smudges:
+                break
+        if differences == smudges:
+            return k
+    return 0
 
 
-def find_mirror(grid):
-    for c, _ in enumerate(grid[0][1:], start=1):
-        if all(has_mirror_at(c, row) for row in grid):
-            return c
-    return -1
+def summarize(masks, smudges=0):
+    """
+    Return the summary number of the reflection with smudges smudges of the
+    pattern with masks, its row masks and column masks.
+    """
+    rows, cols = masks
+    cs = find_reflection(cols, smudges)
+    if cs:
+        return cs
+    rs = find_reflection(rows, smudges)
+    assert rs
+    return 100 * rs
 
 
-def test_find_mirror():
+def test_find_reflection():
     grid1, grid2 = read_input('../../data/13/test13a.txt')
-    assert find_mirror(grid1) == 5
-    grid2_t = rotate_grid(grid2)
-    assert find_mirror(grid2_t) == 4
+    assert find_reflection(column_masks(grid1)) == 5
+    assert find_reflection(row_masks(grid2)) == 4
 
     grid1 = read_input('../../data/13/test13b.txt')[0]
-    grid1_t = rotate_grid(grid1)
-    assert find_mirror(rotate_grid(grid1)) == 1
+    assert find_reflection(row_masks(grid1)) == 1
 
 
 def solve_a(grids):
-    rs, cs = 0, 0
-    for grid in grids:
-        p = find_mirror(grid)
-        cs += max(0, p)
-        if p == -1:
-            grid_t = rotate_grid(grid)
-            p = find_mirror(grid_t)
-            rs += max(0, p)
-        assert p != -1
-    return (100 * rs) + cs
+    return sum(summarize(pattern_masks(grid)) for grid in grids)
 
 
 def test_solve_a():
@@ -99,85 +104,35 @@ def test_solve_a():
     assert solve_a(grids) == expected
 
 
-def find_mirror_b(grid):
-    "Return list of all possible reflection points in grid"
-    result = []
-    for c, _ in enumerate(grid[0][1:], start=1):
-        if all(has_mirror_at(c, row) for row in grid):
-            result.append(c)
-    return result
-
-
-def fix_smudge(grid):
-    # Find original row/col
-    rs0, cs0 = find_mirror(rotate_grid(grid)), find_mirror(grid)
-
-    # Transform into list of list of chars to make it mutable
-    grid = [[c for c in row] for row in grid]
-
-    # For every possible smudge find any reflection points that are different
-    # than the original reflection point
-    rs1, cs1 = -1, -1
-    for r, row in enumerate(grid):
-        for c, _ in enumerate(row):
-
-            # Swap the character here
-            if grid[r][c] == '.':
-                grid[r][c] = '#'
-            else:
-                grid[r][c] = '.'
-
-            grid_t = rotate_grid(grid)
-            for rs_ in find_mirror_b(grid_t):
-                if rs_ > 0 and rs_ != rs0:
-                    rs1 = rs_
-            if rs1 == -1:
-                for cs_ in find_mirror_b(grid):
-                    if cs_ > 0 and cs_ != cs0:
-                        cs1 = cs_
-
-            # Swap the character back
-            if grid[r][c] == '.':
-                grid[r][c] = '#'
-            else:
-                grid[r][c] = '.'
-
-            if rs1 > 0 or cs1 > 0:
-                break
-
-    return rs1, cs1
-
-
 def solve_b(grids):
-    rs, cs = 0, 0
-    for g, grid in enumerate(grids):
-        result = fix_smudge(grid)
-        # Original result is first item
-        rs1, cs1 = fix_smudge(grid)
-        if rs1 == -1 and cs1 == -1:
-            print('NOT OK')
-        rs += max(0, rs1)
-        cs += max(0, cs1)
-    return (100 * rs) + cs
+    # The smudge is the one cell that differs from its reflection across the
+    # new line.
+    return sum(summarize(pattern_masks(grid), 1) for grid in grids)
 
 
 def test_solve_b():
     grids = read_input('../../data/13/test13a.txt')
     expected = 400
     assert solve_b(grids) == expected
+    grid1, grid2 = grids
+    assert find_reflection(row_masks(grid1), 1) == 3
+    assert find_reflection(row_masks(grid2), 1) == 1
+    assert find_reflection(column_masks(grid1), 1) == 0
 
 
 def main():
     "Main program"
-    import pyperclip
-    grids = read_input('../../data/13/input13.txt')
-    soln_a = solve_a(grids)
+    soln_a, soln_b = 0, 0
+    for pattern in iter_patterns('../../data/13/input13.txt'):
+        # Both parts use the same masks, built once per pattern.
+        masks = pattern_masks(pattern)
+        soln_a += summarize(masks)
+        soln_b += summarize(masks, 1)
     print('The summary number is', soln_a)
     assert soln_a == 37113
-    soln_b = solve_b(grids)
     print('The summary number with new reflection lines is', soln_b)
     assert soln_b == 30449
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
@@ -6,220 +6,140 @@ jramaswami
 """
 
 
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import grid as aocgrid
+from aoc import output
+
+
 def read_input(path):
-    with open(path, 'r') as infile:
-        grid = [[c for c in line.strip()] for line in infile]
-    return grid
+    return aocgrid.Grid.read(path)
 
 
-def S(n):
-    if n < 0:
-        return 0
-    return (n * (n + 1)) // 2
+ROCK, CUBE, EMPTY = ord('O'), ord('#'), ord('.')
 
 
-def compute_load(rocks, row):
-    return (row * rocks) - S(rocks-1)
+def platform(grid):
+    "Return the cells of grid as a bytearray of flat indices for tilting in place."
+    return bytearray(grid.cells.tobytes())
 
 
-def solve_a(grid):
-    # Compute number of rocks that roll to the north.
-    soln = 0
-    curr_rocks = [0 for _ in grid[0]]
-    N = len(grid)
-    for r, row in enumerate(reversed(grid)):
-        for c, cell in enumerate(row):
-            if cell == '#':
-                # Add the load of these rocks to solution
-                soln += compute_load(curr_rocks[c], r)
-                curr_rocks[c] = 0
-            elif cell == 'O':
-                curr_rocks[c] += 1
-    # Add the load for all the rocks that stopped at the top of the grid
-    soln += sum(compute_load(cr, N) for cr in curr_rocks)
-    return soln
+def tilt_lines(height, width):
+    """
+    Return the lines of flat indices that rocks roll along for tilts north,
+    west, south and east.  Each line starts at the edge the rocks roll to.
+    """
+    size = height * width
+    north = [range(c, size, width) for c in range(width)]
+    west = [range(r * width, (r + 1) * width) for r in range(height)]
+    south = [range(size - width + c, -1, -width) for c in range(width)]
+    east = [range((r + 1) * width - 1, r * width - 1, -1) for r in range(height)]
+    return north, west, south, east
 
 
-def test_soln_a():
-    grid = read_input('../../data/14/test14a.txt')
-    assert solve_a(grid) == 136
+def tilt(cells, lines):
+    for line in lines:
+        # Roll each rock to the free cell nearest the edge.
+        free = line.start
+        for p in line:
+            cell = cells[p]
+            if cell == CUBE:
+                free = p + line.step
+            elif cell == ROCK:
+                if p != free:
+                    cells[free] = ROCK
+                    cells[p] = EMPTY
+                free += line.step
 
 
-def print_grid(grid):
-    for row in grid:
-        print(''.join(row))
-    print()
-
-
-def count_items(grid):
-    hs, os = 0, 0
-    for row in grid:
-        for cell in row:
-            if cell == '#':
-                hs += 1
-            if cell == 'O':
-                os += 1
-    return hs, os
-
-
-def tilt_north(grid):
-    ck = count_items(grid)
-    limits = [-1 for _ in grid[0]]
-    for r, row in enumerate(grid):
-        for c, cell in enumerate(row):
-            if cell == '#':
-                limits[c] = r
-            elif cell == 'O':
-                # Roll rock to just under the current limit
-                r0 = limits[c]
-                if r != r0:
-                    grid[r][c] = '.'
-                    grid[r0+1][c] = 'O'
-                # Move limit down
-                limits[c] += 1
-    assert count_items(grid) == ck
-
-
-def tilt_west(grid):
-    ck = count_items(grid)
-    N, M = len(grid), len(grid[0])
-    limits = [-1 for _ in range(N)]
-    for c in range(M):
-        for r in range(N):
-            if grid[r][c] == '#':
-                limits[r] = c
-            elif grid[r][c] == 'O':
-                # Roll rock just to the right of the current limit
-                c0 = limits[r] + 1
-                if c0 != c:
-                    grid[r][c0] = 'O'
-                    grid[r][c] = '.'
-                limits[r] = c0
-    assert count_items(grid) == ck
-
-
-def tilt_south(grid):
-    ck = count_items(grid)
-    N, M = len(grid), len(grid[0])
-    limits = [N for _ in grid[0]]
-    for r in range(N-1, -1, -1):
-        for c in range(M):
-            cell = grid[r][c]
-            if cell == '#':
-                limits[c] = r
-            elif cell == 'O':
-                # Roll rock to just above the current limit
-                r0 = limits[c]
-                if r != r0:
-                    grid[r][c] = '.'
-                    grid[r0-1][c] = 'O'
-                # Move limit down
-                limits[c] -= 1
-    assert count_items(grid) == ck
-
-
-def tilt_east(grid):
-    ck = count_items(grid)
-    N, M = len(grid), len(grid[0])
-    limits = [M for _ in range(N)]
-    for c in range(M-1, -1, -1):
-        for r in range(N):
-            if grid[r][c] == '#':
-                limits[r] = c
-            elif grid[r][c] == 'O':
-                # Roll rock just to the left of the current limit
-                c0 = limits[r] - 1
-                if c0 != c:
-                    grid[r][c0] = 'O'
-                    grid[r][c] = '.'
-                limits[r] = c0
-    assert count_items(grid) == ck
-
-
-def spin(grid):
-    tilt_north(grid)
-    tilt_west(grid)
-    tilt_south(grid)
-    tilt_east(grid)
+def spin(cells, lines):
+    for direction in lines:
+        tilt(cells, direction)
 
 
-def test_spin():
-    grid = read_input('../../data/14/test14a.txt')
-    spin(grid)
-    expected = read_input('../../data/14/cycle1.txt')
-    assert grid == expected
-    spin(grid)
-    expected = read_input('../../data/14/cycle2.txt')
-    assert grid == expected
-    spin(grid)
-    expected = read_input('../../data/14/cycle3.txt')
-    assert grid == expected
-
-
-def compute_grid_load(grid):
+def compute_grid_load(cells, height, width):
     load = 0
-    N = len(grid)
-    for r, row in enumerate(grid):
-        for _, cell in enumerate(row):
-            if cell == 'O':
-                load += N - r
+    p = cells.find(ROCK)
+    while p >= 0:
+        load += height - p // width
+        p = cells.find(ROCK, p + 1)
     return load
 
 
 def test_compute_grid_load():
     grid = read_input('../../data/14/test14a.txt')
-    tilt_north(grid)
-    assert compute_grid_load(grid) == 136
+    cells = platform(grid)
+    north, _, _, _ = tilt_lines(grid.height, grid.width)
+    tilt(cells, north)
+    assert compute_grid_load(cells, grid.height, grid.width) == 136
 
 
-def solve_b(grid):
+def solve_a(grid):
+    cells = platform(grid)
+    north, _, _, _ = tilt_lines(grid.height, grid.width)
+    tilt(cells, north)
+    return compute_grid_load(cells, grid.height, grid.width)
+
+
+def test_soln_a():
+    grid = read_input('../../data/14/test14a.txt')
+    assert solve_a(grid) == 136
+
+
+def test_spin():
+    grid = read_input('../../data/14/test14a.txt')
+    cells = platform(grid)
+    lines = tilt_lines(grid.height, grid.width)
+    for expected in ('cycle1.txt', 'cycle2.txt', 'cycle3.txt'):
+        spin(cells, lines)
+        assert cells == platform(read_input('../../data/14/' + expected))
+
+
+def solve_b(grid, cycles=1000000000):
+    # The rocks are back where they were after some earlier cycle as soon as
+    # the grid repeats, so stop at the first repeat and look up the load of
+    # the cycle that the last one matches.
+    cells = platform(grid)
+    lines = tilt_lines(grid.height, grid.width)
+    seen = {}
     loads = []
-    for tick in range(1000):
-        spin(grid)
-        gl = compute_grid_load(grid)
-        loads.append(gl)
-
-    # Floyd's cycle detection, use subarray to avoid the singles that are
-    # repeated, like 69 in the sample data
-    k = 7
-    slow = fast = 0
-    cycle_detected = False
-    while fast < len(loads):
-        slow += 1
-        fast += 2
-        if loads[slow:slow+k] == loads[fast:fast+k]:
-            print('cycle detected')
-            cycle_detected = True
-            break
-
-    if cycle_detected:
-        mu = 0
-        while loads[mu:mu+k] != loads[slow:slow+k]:
-            slow += 1
-            mu += 1
-
-    cycle = loads[mu:slow]
-    target = 1000000000 - 1 # Subtract one to make zero based
-    target -= mu
-    target %= len(cycle)
-    return cycle[target]
+    for tick in range(cycles):
+        spin(cells, lines)
+        state = bytes(cells)
+        if state in seen:
+            mu = seen[state]
+            return loads[mu + (cycles - 1 - mu) % (tick - mu)]
+        seen[state] = tick
+        loads.append(compute_grid_load(cells, grid.height, grid.width))
+    return compute_grid_load(cells, grid.height, grid.width)
 
 
 def test_solve_b():
     grid = read_input('../../data/14/test14a.txt')
     assert solve_b(grid) == 64
+    # Before and around the first repeat.
+    lines = tilt_lines(grid.height, grid.width)
+    for cycles in range(0, 20):
+        cells = platform(grid)
+        for _ in range(cycles):
+            spin(cells, lines)
+        expected = compute_grid_load(cells, grid.height, grid.width)
+        assert solve_b(grid, cycles) == expected
 
 
 def main():
     "Main program"
-    import pyperclip
     grid = read_input('../../data/14/input14.txt')
     soln_a = solve_a(grid)
     print('The total load is', soln_a)
     assert soln_a == 111979
     soln_b = solve_b(grid)
     print('After 1000000000 cycles, the total load is', soln_b)
-    pyperclip.copy(str(soln_b))
+    assert soln_b == 102055
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
@@ -7,6 +7,12 @@ jramaswami
 
 
 import collections
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import output
 
 
 def compute_hash(s):
@@ -117,7 +123,6 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
     init_seq = read_input('../../data/15/input15.txt')
     soln_a = solve_a(init_seq)
     print('The sum of the results is', soln_a)
@@ -125,7 +130,7 @@ def main():
     soln_b = solve_b(init_seq)
     print('The focusing power of the configuration is', soln_b)
     assert soln_b == 260530
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
@@ -6,120 +6,87 @@ jramaswami
 """
 
 
-import collections
+import os
+import sys
 
+import numpy as np
 
-Vector = collections.namedtuple('Vector', ['row', 'col'])
-Vector.__add__ = lambda a, b: Vector(a.row + b.row, a.col + b.col)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
+from aoc import grid as aocgrid
+from aoc import output
 
-Beam = collections.namedtuple('Beam', ['posn', 'dirn'])
 
+# The grid is padded with OUTSIDE, where a beam stops.
+EAST, SOUTH, WEST, NORTH = 0, 1, 2, 3
+OFFSETS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+OUTSIDE = ord('#')
 
-EAST, SOUTH, WEST, NORTH = (Vector(0, 1),  Vector(1, 0), Vector(0, -1), Vector(-1, 0))
+
+def turn_table():
+    "Return, for every character code, the directions a beam heading each way leaves in"
+    turns = [() for _ in range(256)]
+    turns[ord('.')] = ((EAST,), (SOUTH,), (WEST,), (NORTH,))
+    turns[ord('/')] = ((NORTH,), (WEST,), (SOUTH,), (EAST,))
+    turns[ord('\\')] = ((SOUTH,), (EAST,), (NORTH,), (WEST,))
+    # Splitters let a beam through when it strikes them end on and split it
+    # otherwise.
+    turns[ord('|')] = ((NORTH, SOUTH), (SOUTH,), (NORTH, SOUTH), (NORTH,))
+    turns[ord('-')] = ((EAST,), (EAST, WEST), (WEST,), (EAST, WEST))
+    return turns
+
+
+TURNS = turn_table()
 
 
 def read_input(path):
-    with open(path, 'r') as infile:
-        grid = [line.strip() for line in infile]
-    return grid
-
-
-def next_positions(beam, grid):
-    cell = grid[beam.posn.row][beam.posn.col]
-    if cell == '.':
-        # Beam on '.' continues the same.
-        return [Beam(beam.posn + beam.dirn, beam.dirn)]
-    if cell == '/':
-        # Beam on / turns 90deg
-        if beam.dirn == EAST:
-            # EAST -> NORTH
-            new_dirn = NORTH
-        elif beam.dirn == SOUTH:
-            # SOUTH -> WEST
-            new_dirn = WEST
-        elif beam.dirn == NORTH:
-            # NORTH -> EAST
-            new_dirn = EAST
-        elif beam.dirn == WEST:
-            # WEST -> SOUTH
-            new_dirn = SOUTH
-        else:
-            raise ValueError('Unable to match direction for cell "/"')
-        return [Beam(beam.posn + new_dirn, new_dirn)]
-    elif cell == '\\':
-        # Beam on \ turns 90deg
-        if beam.dirn == EAST:
-            # EAST -> SOUTH
-            new_dirn = SOUTH
-        elif beam.dirn == SOUTH:
-            # SOUTH -> EAST
-            new_dirn = EAST
-        elif beam.dirn == NORTH:
-            # NORTH -> WEST
-            new_dirn = WEST
-        elif beam.dirn == WEST:
-            # WEST -> NORTH
-            new_dirn = NORTH
-        else:
-            raise ValueError('Unable to match direction for cell "\\"')
-        return [Beam(beam.posn + new_dirn, new_dirn)]
-    elif cell == '|':
-        if beam.dirn == SOUTH or beam.dirn == NORTH:
-            # Beam goes through splitter when striking parallel
-            result = [Beam(beam.posn + beam.dirn, beam.dirn)]
-        else:
-            # Beam splits when striking splitter perpendicular
-            result = [Beam(beam.posn + NORTH, NORTH), Beam(beam.posn + SOUTH, SOUTH)]
-        return result
-    elif cell == '-':
-        if beam.dirn == EAST or beam.dirn == WEST:
-            # Beam goes through splitter when striking parallel
-            return [Beam(beam.posn + beam.dirn, beam.dirn)]
-        else:
-            # Beam splits when striking splitter perpendicular
-            return [Beam(beam.posn + EAST, EAST), Beam(beam.posn + WEST, WEST)]
-
-
-def inbounds(beam, grid):
-    return (
-        beam.posn.row >= 0 and
-        beam.posn.col >= 0 and
-        beam.posn.row < len(grid) and
-        beam.posn.col < len(grid[beam.posn.row])
-    )
-
-
-def get_energized(grid, init_beam):
-    energized = [[False for _ in row] for row in grid]
-    queue = collections.deque()
-    energized[init_beam.posn.row][init_beam.posn.col] = True
-    visited = set()
-    visited.add(init_beam)
-    queue.append(init_beam)
-
-    while queue:
-        beam = queue.popleft()
-        energized[beam.posn.row][beam.posn.col] = True
-        for beam0 in next_positions(beam, grid):
-            if inbounds(beam0, grid) and beam0 not in visited:
-                visited.add(beam0)
-                queue.append(beam0)
+    return aocgrid.Grid.read(path)
+
+
+def contraption(grid):
+    "Return grid padded with OUTSIDE, its cells as bytes and the flat offsets of OFFSETS"
+    padded = grid.padded(chr(OUTSIDE))
+    return padded, padded.cells.tobytes(), padded.flat_offsets(OFFSETS)
+
+
+def energize(cells, steps, start, dirn):
+    "Return the set of flat indices energized by a beam entering start heading dirn"
+    # Each (position, direction) a beam can be in is visited once.
+    visited = bytearray(4 * len(cells))
+    visited[4 * start + dirn] = 1
+    stack = [(start, dirn)]
+    energized = set()
+    while stack:
+        p, d = stack.pop()
+        energized.add(p)
+        for d0 in TURNS[cells[p]][d]:
+            q = p + steps[d0]
+            if cells[q] != OUTSIDE and not visited[4 * q + d0]:
+                visited[4 * q + d0] = 1
+                stack.append((q, d0))
     return energized
 
 
+def get_energized(grid, start=(0, 0), dirn=EAST):
+    "Return a boolean array that is True for the energized tiles of grid"
+    padded, cells, steps = contraption(grid)
+    energized = energize(cells, steps, padded.flat(start[0] + 1, start[1] + 1), dirn)
+    mask = np.zeros(padded.height * padded.width, dtype=bool)
+    mask[list(energized)] = True
+    return mask.reshape(padded.height, padded.width)[1:-1, 1:-1]
+
+
 def test_get_energized():
     grid = read_input('../../data/16/test16a.txt')
-    result = get_energized(grid, Beam(Vector(0,0), EAST))
+    result = get_energized(grid, (0, 0), EAST)
     sample = read_input('../../data/16/result16a.txt')
-    expected = [[True if t == '#' else False for t in row] for row in sample]
-    assert result == expected
+    expected = sample.mask('#')
+    assert (result == expected).all()
 
 
-def solve_a(grid, init_beam=Beam(Vector(0,0), EAST)):
-    energized = get_energized(grid, init_beam)
-    result = sum(sum(row) for row in energized)
-    return result
+def solve_a(grid, start=(0, 0), dirn=EAST):
+    padded, cells, steps = contraption(grid)
+    return len(energize(cells, steps, padded.flat(start[0] + 1, start[1] + 1), dirn))
 
 
 def test_solve_a():
@@ -129,18 +96,19 @@ def test_solve_a():
 
 
 def solve_b(grid):
-    soln_b = 0
-    for c, _ in enumerate(grid[0]):
+    padded, cells, steps = contraption(grid)
+    starts = []
+    for c in range(1, grid.width + 1):
         # Top row heads south
-        soln_b = max(soln_b, solve_a(grid, Beam(Vector(0, c), SOUTH)))
+        starts.append((padded.flat(1, c), SOUTH))
         # Bottom row heads north
-        soln_b = max(soln_b, solve_a(grid, Beam(Vector(len(grid)-1, c), NORTH)))
-    for r, _ in enumerate(grid):
+        starts.append((padded.flat(grid.height, c), NORTH))
+    for r in range(1, grid.height + 1):
         # Left col heads east
-        soln_b = max(soln_b, solve_a(grid, Beam(Vector(r, 0), EAST)))
+        starts.append((padded.flat(r, 1), EAST))
         # Right col head west
-        soln_b = max(soln_b, solve_a(grid, Beam(Vector(r, len(grid[0])-1), WEST)))
-    return soln_b
+        starts.append((padded.flat(r, grid.width), WEST))
+    return max(len(energize(cells, steps, p, d)) for p, d in starts)
 
 
 def test_solve_b():
@@ -151,14 +119,14 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
     grid = read_input('../../data/16/input16.txt')
     soln_a = solve_a(grid)
     print(soln_a, 'tiles end up begin energized')
     assert soln_a == 8539
     soln_b = solve_b(grid)
     print('The maximum possible number of energized tiles is', soln_b)
-    pyperclip.copy(str(soln_b))
+    assert soln_b == 8674
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
@@ -6,102 +6,86 @@ jramaswami
 """
 
 
-import collections
+import heapq
 import math
+import os
+import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-Vector = collections.namedtuple('Vector', ['row', 'col'])
-Vector.__add__ = lambda a, b: Vector(a.row + b.row, a.col + b.col)
-Vector.reverse = lambda a: Vector(a.row * -1, a.col * -1)
+from aoc import grid as aocgrid
+from aoc import output
 
 
-Crucible = collections.namedtuple('Crucible', ['posn', 'dirn', 'consecutive_blocks'])
-
-
-QItem = collections.namedtuple('QItem', ['heat_loss', 'crucible'])
-
-
-EAST, SOUTH, WEST, NORTH = (Vector(0, 1),  Vector(1, 0), Vector(0, -1), Vector(-1, 0))
-DIRECTIONS   = (EAST, SOUTH, WEST, NORTH)
+# The grid is padded with WALL.  A crucible's state is its position, the
+# direction it last moved in, or -1 before it has moved, and how many blocks
+# in a row it has moved that way.
+EAST, SOUTH, WEST, NORTH = 0, 1, 2, 3
+DIRECTIONS = (EAST, SOUTH, WEST, NORTH)
+OFFSETS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+WALL = ord('#')
+ZERO = ord('0')
 
 
 def read_input(path):
-    with open(path, 'r') as infile:
-        grid = [[int(t) for t in line.strip()] for line in infile]
-    return grid
-
-
-def inbounds(crucible, grid):
-    return (
-        crucible.posn.row >= 0 and
-        crucible.posn.col >= 0 and
-        crucible.posn.row < len(grid) and
-        crucible.posn.col < len(grid[crucible.posn.row])
-    )
+    return aocgrid.Grid.read(path)
 
 
-def neighbors(crucible, grid):
-    for dirn in DIRECTIONS:
+def neighbors(p, dirn, consecutive_blocks, cells, steps):
+    for d in DIRECTIONS:
         # Cannot go in reverse
-        if crucible.dirn and dirn == crucible.dirn.reverse():
+        if dirn >= 0 and d == (dirn + 2) % 4:
             continue
         # Consecutive blocks
-        if dirn == crucible.dirn:
-            crucible0 = Crucible(crucible.posn + dirn, dirn, crucible.consecutive_blocks+1)
-        else:
-            crucible0 = Crucible(crucible.posn + dirn, dirn, 1)
-        if inbounds(crucible0, grid) and crucible0.consecutive_blocks <= 3:
-            yield crucible0
+        blocks = consecutive_blocks + 1 if d == dirn else 1
+        q = p + steps[d]
+        if cells[q] != WALL and blocks <= 3:
+            yield q, d, blocks
 
 
-def ultimate_neighbors(crucible, grid):
-    if crucible.dirn and crucible.consecutive_blocks < 4:
+def ultimate_neighbors(p, dirn, consecutive_blocks, cells, steps):
+    if dirn >= 0 and consecutive_blocks < 4:
         # Once an ultra crucible starts moving in a direction, it needs
         # to move a minimum of four blocks
-        crucible0 = Crucible(crucible.posn + crucible.dirn, crucible.dirn, crucible.consecutive_blocks+1)
-        if inbounds(crucible0, grid):
-            yield crucible0
+        q = p + steps[dirn]
+        if cells[q] != WALL:
+            yield q, dirn, consecutive_blocks + 1
     else:
-        for dirn in DIRECTIONS:
+        for d in DIRECTIONS:
             # Cannot go in reverse
-            if crucible.dirn and dirn == crucible.dirn.reverse():
+            if dirn >= 0 and d == (dirn + 2) % 4:
                 continue
-            if dirn == crucible.dirn:
-                crucible0 = Crucible(crucible.posn + dirn, dirn, crucible.consecutive_blocks+1)
-            else:
-                crucible0 = Crucible(crucible.posn + dirn, dirn, 1)
-            if inbounds(crucible0, grid) and crucible0.consecutive_blocks <= 10:
+            blocks = consecutive_blocks + 1 if d == dirn else 1
+            q = p + steps[d]
+            if cells[q] != WALL and blocks <= 10:
                 # An ultra crucible can move a maximum of ten consecutive
                 # blocks without turning
-                yield crucible0
+                yield q, d, blocks
 
 
 def solve(grid, neighborsfn=neighbors):
-    cache = collections.defaultdict(lambda: math.inf)
-    init_crucible = Crucible(Vector(0, 0), None, 0)
-    target_posn = Vector(len(grid)-1, len(grid[-1])-1)
-    cache[init_crucible] = 0
-    queue = collections.deque()
-    queue.append(QItem(0, init_crucible))
-    soln = math.inf
+    padded = grid.padded(chr(WALL))
+    cells = padded.cells.tobytes()
+    steps = padded.flat_offsets(OFFSETS)
+    start = padded.flat(1, 1)
+    target = padded.flat(grid.height, grid.width)
+    # An ultimate crucible cannot stop on the last block until it has gone
+    # at least 4 consecutive blocks
+    min_blocks = 4 if neighborsfn is ultimate_neighbors else 0
+    best = {(start, -1, 0): 0}
+    queue = [(0, start, -1, 0)]
     while queue:
-        item = queue.popleft()
-        if cache[item.crucible] != item.heat_loss:
+        heat_loss, p, dirn, blocks = heapq.heappop(queue)
+        if best[(p, dirn, blocks)] != heat_loss:
             continue
-        if item.crucible.posn == target_posn:
-            if neighborsfn == ultimate_neighbors:
-                if item.crucible.consecutive_blocks >= 4:
-                    # An ultimate crucible cannot stop on the last block
-                    # until it has gone at least 4 consecutive blocks
-                    soln = min(soln, item.heat_loss)
-            else:
-                soln = min(soln, item.heat_loss)
-        for crucible0 in neighborsfn(item.crucible, grid):
-            heat_loss0 = item.heat_loss + grid[crucible0.posn.row][crucible0.posn.col]
-            if heat_loss0 < cache[crucible0]:
-                cache[crucible0] = heat_loss0
-                queue.append(QItem(heat_loss0, crucible0))
-    return soln
+        if p == target and blocks >= min_blocks:
+            return heat_loss
+        for crucible in neighborsfn(p, dirn, blocks, cells, steps):
+            heat_loss0 = heat_loss + cells[crucible[0]] - ZERO
+            if heat_loss0 < best.get(crucible, math.inf):
+                best[crucible] = heat_loss0
+                heapq.heappush(queue, (heat_loss0, *crucible))
+    return math.inf
 
 
 def test_solve_a():
@@ -118,14 +102,14 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
     grid = read_input('../../data/17/input17.txt')
     soln_a = solve(grid)
     print('The minimum heatloss is', soln_a)
     assert soln_a == 963
     soln_b = solve(grid, ultimate_neighbors)
     print('The minimum heatloss of an ultimate crucible is', soln_b)
-    pyperclip.copy(str(soln_b))
+    assert soln_b == 1178
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
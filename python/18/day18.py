@@ -15,6 +15,13 @@ REF: https://www.reddit.com/r/adventofcode/comments/18lj7wx/2023_day_18_how_do_y
 
 import collections
 import math
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import loader
+from aoc import output
 
 
 Vector = collections.namedtuple('Vector', ['row', 'col'])
@@ -30,13 +37,12 @@ DIRECTIONS = {'R': Vector(0, 1), 'L': Vector(0, -1), 'U': Vector(-1, 0), 'D': Ve
 
 def read_input(path):
     dig_instructions = []
-    with open(path, 'r') as infile:
-        for line in infile:
-            tokens = line.strip().split()
-            dirn = DIRECTIONS[tokens[0].strip()]
-            meters = int(tokens[1])
-            color = tokens[2][1:-1]
-            dig_instructions.append(DigInstruction(dirn, meters, color))
+    for line in loader.iter_lines(path):
+        tokens = line.split()
+        dirn = DIRECTIONS[tokens[0].strip()]
+        meters = int(tokens[1])
+        color = tokens[2][1:-1]
+        dig_instructions.append(DigInstruction(dirn, meters, color))
     return dig_instructions
 
 
@@ -94,15 +100,14 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
     dig_instructions = read_input('../../data/18/input18.txt')
     soln_a = solve(dig_instructions)
     print('The volume of the trench is', soln_a)
     assert soln_a == 39194
-    pyperclip.copy(str(soln_a))
+    output.copy(soln_a)
     soln_b = solve(translate_dig_instructions(dig_instructions))
     print('The volume of the hexadecimal lagoon is', soln_b)
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
@@ -8,6 +8,12 @@ jramaswami
 
 import collections
 import operator
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import output
 
 
 Operation = collections.namedtuple('Operation', ['comparison', 'destination'])
@@ -175,7 +181,6 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
     # workflows, parts = read_input('../../data/19/test19a.txt')
     workflows, parts = read_input('../../data/19/input19.txt')
     soln_a = solve_a(parts, workflows)
@@ -184,7 +189,7 @@ def main():
     soln_b = solve_b(workflows)
     print('The distinct ratings combinations that are accepted is', soln_b)
     assert soln_b == 128163929109524
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
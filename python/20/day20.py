@@ -175,7 +175,6 @@ def solve_b(modules_by_name, module_connections):
 
 def main():
     "Main program"
-    import pyperclip
     modules_by_name, module_connections = parse_input('../../data/20/input20.txt')
     soln_a = solve_a(modules_by_name, module_connections)
     print('Solution a is', soln_a)
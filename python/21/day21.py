@@ -10,51 +10,37 @@ Thank you to HyperNeutrino.  There is no way I was going to get the answer!
 
 
 import collections
-import math
+import os
+import sys
 
+import numpy as np
 
-Vector = collections.namedtuple('Vector', ['row', 'col'])
-Vector.__add__ = lambda a, b: Vector(a.row + b.row, a.col + b.col)
-
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-OFFSETS = (Vector(1,0), Vector(-1,0), Vector(0,1), Vector(0,-1))
+from aoc import grid as aocgrid
+from aoc import output
 
 
-def read_input(path):
-    with open(path, 'r') as infile:
-        grid = [line.strip() for line in infile]
-    return grid
-
-
-def inbounds(p, grid):
-    return p.row >= 0 and p.col >=0 and p.row < len(grid) and p.col < len(grid[p.row])
+Vector = collections.namedtuple('Vector', ['row', 'col'])
 
 
-def neighbors(p, grid):
-    for off in OFFSETS:
-        p0 = p + off
-        if inbounds(p0, grid):
-            yield p0
+def read_input(path):
+    return aocgrid.Grid.read(path)
 
 
 def find_start(grid):
-    for r, row in enumerate(grid):
-        for c, cell in enumerate(row):
-            if grid[r][c] == 'S':
-                return Vector(r, c)
+    return Vector(*grid.find('S'))
 
 
 def solve_a(grid, ticks):
-    curr_queue = set()
-    curr_queue.add(find_start(grid))
-    next_queue = set()
+    # Every tick, the plots the elf can be on are the open plots next to the
+    # plots it could be on in the previous tick.
+    plots = ~grid.mask('#')
+    reachable = np.zeros_like(plots)
+    reachable[find_start(grid)] = True
     for _ in range(ticks):
-        for p in curr_queue:
-            for p0 in neighbors(p, grid):
-                if grid[p0.row][p0.col] != '#':
-                    next_queue.add(p0)
-        curr_queue, next_queue = next_queue, set()
-    return len(curr_queue)
+        reachable = aocgrid.dilate(reachable) & plots
+    return int(np.count_nonzero(reachable))
 
 
 def test_solve_a():
@@ -64,27 +50,21 @@ def test_solve_a():
 
 
 def fill(start, ticks, grid):
-    soln = set()
-    visited = set()
-    visited.add(start)
-    queue = collections.deque()
-    queue.append((start, ticks))
-    while queue:
-        p, d = queue.popleft()
-        if d % 2 == 0:
-            soln.add(p)
-        if d == 0:
-            continue
-        for p0 in neighbors(p, grid):
-            if not inbounds(p0, grid):
-                continue
-            if grid[p0.row][p0.col] == '#':
-                continue
-            if p0 in visited:
-                continue
-            visited.add(p0)
-            queue.append((p0, d-1))
-    return len(soln)
+    # Breadth first search one step at a time.  A plot first reached after d
+    # steps can be stood on after ticks steps when ticks - d is even.
+    plots = ~grid.mask('#')
+    frontier = np.zeros_like(plots)
+    frontier[start] = True
+    visited = frontier.copy()
+    soln = 1 if ticks % 2 == 0 else 0
+    for d in range(1, ticks+1):
+        frontier = aocgrid.dilate(frontier) & plots & ~visited
+        if not frontier.any():
+            break
+        visited |= frontier
+        if (ticks - d) % 2 == 0:
+            soln += int(np.count_nonzero(frontier))
+    return soln
 
 
 def test_fill():
@@ -97,8 +77,8 @@ def test_fill():
 
 
 def solve_b(grid):
-    assert len(grid) == len(grid[0])
-    size = len(grid)
+    assert grid.height == grid.width
+    size = grid.height
     steps = 26501365
     start = find_start(grid)
     assert start.row == start.col == size // 2
@@ -139,17 +119,16 @@ def solve_b(grid):
 
 def main():
     "Main program"
-    import pyperclip
     grid = read_input('../../data/21/input21.txt')
     soln_a = solve_a(grid, 64)
     print('The elf can reach', soln_a, 'garden plots in 64 steps')
     assert soln_a == 3649
-    pyperclip.copy(str(soln_a))
+    output.copy(soln_a)
 
     soln_b = solve_b(grid)
     print('Solution b', soln_b)
     assert soln_b == 612941134797232
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
@@ -7,6 +7,13 @@ jramaswami
 
 
 import collections
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import loader
+from aoc import output
 
 
 Vector = collections.namedtuple('Vector', ['x', 'y', 'z'])
@@ -33,13 +40,11 @@ def bricks_intersect_xy(b1, b2):
 
 def parse_input(path):
     bricks = []
-    with open(path, 'r') as infile:
-        for line in infile:
-            line = line.strip()
-            left, right = line.split('~')
-            p1 = Vector._make(int(x) for x in left.split(','))
-            p2 = Vector._make(int(x) for x in right.split(','))
-            bricks.append(Brick(p1, p2, len(bricks)+1))
+    for line in loader.iter_lines(path):
+        left, right = line.split('~')
+        p1 = Vector._make(int(x) for x in left.split(','))
+        p2 = Vector._make(int(x) for x in right.split(','))
+        bricks.append(Brick(p1, p2, len(bricks)+1))
     return bricks
 
 
@@ -119,7 +124,6 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
     bricks = parse_input('../../data/22/input22.txt')
     # bricks = parse_input('../../data/22/test22a.txt')
     soln_a, soln_b = solve(bricks)
@@ -127,7 +131,7 @@ def main():
     assert soln_a == 509
     print('The number of bricks that fall is', soln_b)
     assert soln_b == 102770
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 
@@ -7,47 +7,56 @@ jramaswami
 
 
 import collections
+import os
 import sys
 
+import numpy as np
 
-sys.setrecursionlimit(pow(10,5))
-
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-Vector = collections.namedtuple('Vector', ['row', 'col'])
-Vector.__add__ = lambda a, b: Vector(a.row + b.row, a.col + b.col)
+from aoc import grid as aocgrid
+from aoc import output
 
 
-OFFSETS = (Vector(1, 0), Vector(-1, 0), Vector(0, 1), Vector(0, -1))
+sys.setrecursionlimit(pow(10,5))
 
 
-def inbounds(p, grid):
-    return (
-        p.row >= 0 and p.col >= 0 and
-        p.row < len(grid) and p.col < len(grid[p.row])
-    )
+# The grid is padded with forest.
+OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+SLOPES = {ord(s): i for i, s in enumerate('v^><')}
+FOREST = ord('#')
 
 
-def neighbors(p, grid):
-    if grid[p.row][p.col] in 'v^><':
-        q = p + OFFSETS['v^><'.index(grid[p.row][p.col])]
-        if inbounds(q, grid) and grid[q.row][q.col] != '#':
+def neighbors(p, cells, offsets):
+    if cells[p] in SLOPES:
+        q = p + offsets[SLOPES[cells[p]]]
+        if cells[q] != FOREST:
             yield q
     else:
-        for d in OFFSETS:
+        for d in offsets:
             q = p + d
-            if inbounds(q, grid) and grid[q.row][q.col] != '#':
+            if cells[q] != FOREST:
                 yield q
 
 
 def read_input(path):
-    with open(path, 'r') as infile:
-        grid = [line.strip() for line in infile]
-    return grid
+    return aocgrid.Grid.read(path)
+
+
+def trail_map(grid):
+    """
+    Return the grid padded with forest, the flat offsets of OFFSETS, and
+    the flat indices of the start and the finish.
+    """
+    padded = grid.padded('#')
+    start = padded.flat(1, grid.row(0).index('.') + 1)
+    finish = padded.flat(grid.height, grid.row(grid.height-1).index('.') + 1)
+    return padded, padded.flat_offsets(OFFSETS), start, finish
 
 
 def solve_a(grid):
-    start = Vector(0, grid[0].index('.'))
-    finish = Vector(len(grid)-1, grid[-1].index('.'))
+    padded, offsets, start, finish = trail_map(grid)
+    cells = padded.cells.tobytes()
     visited = set()
 
     def dfs(p, d):
@@ -56,7 +65,7 @@ def solve_a(grid):
             result = d
         else:
             result = 0
-            for q in neighbors(p, grid):
+            for q in neighbors(p, cells, offsets):
                 if q not in visited:
                     result = max(result, dfs(q, d+1))
         visited.remove(p)
@@ -71,22 +80,14 @@ def test_solve_a():
 
 
 def solve_b(grid):
-    start = Vector(0, grid[0].index('.'))
-    finish = Vector(len(grid)-1, grid[-1].index('.'))
-    critical_points = [start, finish]
+    padded, offsets, start, finish = trail_map(grid)
+    cells = padded.cells.tobytes()
 
     # Find any points that branch and add them to critical points
-    for r, row in enumerate(grid):
-        for c, cell in enumerate(row):
-            if cell != '#':
-                ns = 0
-                p = Vector(r, c)
-                for d in OFFSETS:
-                    q = p + d
-                    if inbounds(q, grid) and grid[q.row][q.col] != '#':
-                        ns += 1
-                if ns > 2:
-                    critical_points.append(p)
+    paths = ~padded.mask('#')
+    branches = paths & (aocgrid.count_neighbors(paths) > 2)
+    critical_points = [start, finish] + [int(p) for p in np.flatnonzero(branches)]
+    is_critical = set(critical_points)
 
     # Graph critical points
     graph = collections.defaultdict(list)
@@ -97,13 +98,13 @@ def solve_b(grid):
         visited.add(cp)
         while queue:
             p, d = queue.popleft()
-            if p != cp and p in critical_points:
+            if p != cp and p in is_critical:
                 # Do not go through another critical point
                 graph[cp].append((p, d))
             else:
-                for o in OFFSETS:
+                for o in offsets:
                     q = p + o
-                    if inbounds(q, grid) and grid[q.row][q.col] != '#' and q not in visited:
+                    if cells[q] != FOREST and q not in visited:
                         visited.add(q)
                         queue.append((q, d+1))
 
@@ -137,14 +138,13 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
     grid = read_input('../../data/23/input23.txt')
     soln_a = solve_a(grid)
     print('The longest hike with slippery slopes is', soln_a, 'steps')
     assert soln_a == 2074
     soln_b = solve_b(grid)
     print('The longest hike without slippery slopes is', soln_b, 'steps')
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
     assert soln_b == 6494
 
 
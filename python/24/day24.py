@@ -11,7 +11,13 @@ REF: https://www.youtube.com/watch?v=guOyA7Ijqgk
 
 import collections
 import math
-import sympy
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import loader
+from aoc import output
 
 
 Vector = collections.namedtuple('Vector', ['x', 'y', 'z'])
@@ -24,15 +30,13 @@ Hailstone = collections.namedtuple('Hailstone', ['position', 'velocity'])
 
 def parse_input(path):
     hailstones = []
-    with open(path, 'r') as infile:
-        for line in infile:
-            line = line.strip()
-            position_clause, velocity_clause = line.split(' @ ')
-            position_tokens = (int(p) for p in position_clause.split(', '))
-            velocity_tokens = (int(v) for v in velocity_clause.split(', '))
-            position = Vector._make(position_tokens)
-            velocity = Vector._make(velocity_tokens)
-            hailstones.append(Hailstone(position, velocity))
+    for line in loader.iter_lines(path):
+        position_clause, velocity_clause = line.split(' @ ')
+        position_tokens = (int(p) for p in position_clause.split(', '))
+        velocity_tokens = (int(v) for v in velocity_clause.split(', '))
+        position = Vector._make(position_tokens)
+        velocity = Vector._make(velocity_tokens)
+        hailstones.append(Hailstone(position, velocity))
     return hailstones
 
 
@@ -79,6 +83,7 @@ def test_solve_a():
 
 
 def solve_b(hailstones):
+    import sympy
     xr, yr, zr, vxr, vyr, vzr = sympy.symbols('xr, yr, zr, vxr, vyr, vzr')
     equations = []
     for (sx, sy, sz), (vx, vy, vz) in hailstones:
@@ -96,7 +101,6 @@ def test_solve_b():
 
 def main():
     "Main program"
-    import pyperclip
     hailstones = parse_input('../../data/24/input24.txt')
     soln_a = solve_a(hailstones, (200000000000000, 400000000000000))
     print(soln_a, 'intersections between hailstones will occur')
@@ -104,7 +108,7 @@ def main():
     soln_b = solve_b(hailstones)
     print('You get', soln_b, 'if you add up the X, Y, and Z coordinates of that initial position')
     assert soln_b == 880547248556435
-    pyperclip.copy(str(soln_b))
+    output.copy(soln_b)
 
 
 if __name__ == '__main__':
@@ -9,6 +9,12 @@ jramaswami
 import collections
 import functools
 import operator
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aoc import output
 
 
 def read_input(path):
@@ -61,12 +67,11 @@ def solve_a(edges):
 
 def main():
     "Main program"
-    import pyperclip
     graph = read_input('../../data/25/input25.txt')
     # graph = read_input('../../data/25/test25a.txt')
     soln_a = solve_a(graph)
     print('You get', soln_a, 'if you multiply the sizes of these two groups together')
-    pyperclip.copy(str(soln_a))
+    output.copy(soln_a)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,5 @@
+"""
+Advent of Code
+Shared tools for running the daily solutions
+jramaswami
+"""
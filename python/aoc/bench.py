@@ -0,0 +1,238 @@
+"""
+Advent of Code
+Benchmarks for the daily solutions
+jramaswami
+
+Times the parse step and each part of each day separately.  Every stage is run
+a few times to warm up and then timed over a number of trials; the median and
+95th percentile are reported.  Results can be saved as a JSON baseline, and a
+later run can be compared against that baseline to catch regressions.
+
+With --imports the cold import time of every day module is measured instead,
+and any module over the budget fails the run.  The budget defaults to
+AOC_IMPORT_BUDGET from the environment, or 0.25 seconds.
+
+Usage (from the python directory):
+
+    python -m aoc.bench 12 16 --trials 5 --save baseline.json
+    python -m aoc.bench 12 16 --trials 5 --compare baseline.json
+    python -m aoc.bench 12 --scale 10
+    python -m aoc.bench --imports
+"""
+
+
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from aoc import days
+
+
+# Seconds a fresh interpreter may take to import one day module.
+IMPORT_BUDGET = float(os.environ.get('AOC_IMPORT_BUDGET', 0.25))
+
+# How many times as long as importing numpy the test lets a day module take.
+IMPORT_RATIO = 2
+
+
+def percentile(times, p):
+    "Return the p-th percentile of times using the nearest rank."
+    ordered = sorted(times)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def test_percentile():
+    times = list(range(1, 21))
+    assert percentile(times, 50) == 10
+    assert percentile(times, 95) == 19
+    assert percentile(times, 100) == 20
+    assert percentile([3], 95) == 3
+
+
+def summarize(times):
+    return {
+        'median': statistics.median(times),
+        'p95': percentile(times, 95),
+        'trials': len(times),
+    }
+
+
+def time_stage(stage, warmup, trials, setup=lambda: None):
+    """
+    Return the times of calling stage(setup()) trials times after warmup
+    untimed calls.  Only stage is timed so setup can build fresh arguments
+    for solvers that change their input.
+    """
+    times = []
+    for i in range(warmup + trials):
+        args = setup()
+        start = time.perf_counter()
+        stage(args)
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            times.append(elapsed)
+    return times
+
+
+def benchmark_day(day, path, warmup, trials, label=None):
+    "Return the timing summary of parsing and each part for day on path."
+    module = days.load_module(day)
+    spec = days.DAYS[day]
+    label = label or f'{day:02}'
+    results = {}
+    times = time_stage(lambda _: spec.parse(module, path), warmup, trials)
+    results[f'{label} parse'] = summarize(times)
+    for part, solve in spec.parts.items():
+        times = time_stage(
+            lambda data: solve(module, data), warmup, trials,
+            setup=lambda: spec.parse(module, path)
+        )
+        results[f'{label} {part}'] = summarize(times)
+    return results
+
+
+def test_benchmark_day():
+    results = benchmark_day(1, days.input_path(1), 0, 2)
+    assert sorted(results) == ['01 a', '01 b', '01 parse']
+    assert all(r['trials'] == 2 for r in results.values())
+
+
+def benchmark_scaled_day(day, factor, warmup, trials):
+    "Return the timing summary for day on its input scaled by factor."
+    scale = days.DAYS[day].scale
+    if scale is None:
+        return {}
+    with open(days.input_path(day), 'r') as infile:
+        text = scale(infile.read(), factor)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, f'input{day:02}x{factor}.txt')
+        with open(path, 'w') as outfile:
+            outfile.write(text)
+        return benchmark_day(day, path, warmup, trials, f'{day:02}x{factor}')
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Return (name, baseline median, median) for every stage whose median is
+    more than threshold (a fraction) slower than in the baseline.
+    """
+    regressions = []
+    for name, summary in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]['median']
+        if summary['median'] > base * (1 + threshold):
+            regressions.append((name, base, summary['median']))
+    return regressions
+
+
+def test_find_regressions():
+    baseline = {'01 a': {'median': 1.0}, '01 b': {'median': 1.0}}
+    results = {
+        '01 a': {'median': 1.1}, '01 b': {'median': 1.5}, '02 a': {'median': 9.0}
+    }
+    assert find_regressions(results, baseline, 0.25) == [('01 b', 1.0, 1.5)]
+
+
+def statement_time(statement):
+    "Return the seconds a fresh interpreter takes to run statement."
+    code = (
+        'import time\n'
+        'from aoc import days\n'
+        'start = time.perf_counter()\n'
+        f'{statement}\n'
+        'print(time.perf_counter() - start)\n'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=days.PYTHON_DIR, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout)
+
+
+def import_time(day):
+    "Return the seconds a fresh interpreter takes to import dayNN."
+    return statement_time(f'days.load_module({day})')
+
+
+def test_import_times():
+    # A fixed budget fails on a busy machine, so compare with importing numpy
+    # under the same load.  Days that need numpy at import take about that
+    # long and any other heavy import shows up as much slower.
+    reference = statement_time('import numpy')
+    for day in days.find_days():
+        assert import_time(day) < IMPORT_RATIO * reference, day
+
+
+def report(results):
+    for name, summary in results.items():
+        print(f'{name:12}  median {summary["median"]:9.4f}s  p95 {summary["p95"]:9.4f}s')
+
+
+def main():
+    "Main program"
+    parser = argparse.ArgumentParser(description='Benchmark Advent of Code 2023 solutions.')
+    parser.add_argument('days', nargs='*', type=int, help='days to benchmark (default: all)')
+    parser.add_argument('--trials', type=int, default=5, help='timed runs of each stage')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed runs of each stage')
+    parser.add_argument(
+        '--scale', type=int, action='append', default=[],
+        help='also benchmark a synthetic input this many times larger (repeatable)'
+    )
+    parser.add_argument('--save', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', help='JSON baseline to compare the results against')
+    parser.add_argument(
+        '--threshold', type=float, default=0.25,
+        help='fraction a median may grow over the baseline before failing'
+    )
+    parser.add_argument(
+        '--imports', action='store_true',
+        help='measure the cold import time of each day module instead'
+    )
+    parser.add_argument(
+        '--import-budget', type=float, default=IMPORT_BUDGET,
+        help='seconds allowed to import one day module'
+    )
+    args = parser.parse_args()
+
+    if args.imports:
+        over_budget = False
+        for day in args.days or days.find_days():
+            elapsed = import_time(day)
+            flag = '' if elapsed < args.import_budget else '  OVER BUDGET'
+            over_budget = over_budget or bool(flag)
+            print(f'{day:02} import  {elapsed:9.4f}s{flag}')
+        if over_budget:
+            sys.exit(1)
+        return
+
+    results = {}
+    for day in args.days or days.find_days():
+        results.update(benchmark_day(day, days.input_path(day), args.warmup, args.trials))
+        for factor in args.scale:
+            results.update(benchmark_scaled_day(day, factor, args.warmup, args.trials))
+    report(results)
+
+    if args.save:
+        with open(args.save, 'w') as outfile:
+            json.dump(results, outfile, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, 'r') as infile:
+            baseline = json.load(infile)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for name, base, median in regressions:
+            print(f'REGRESSION {name}: median {median:.4f}s vs baseline {base:.4f}s')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
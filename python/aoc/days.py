@@ -0,0 +1,213 @@
+"""
+Advent of Code
+Discovery of the daily solution modules
+jramaswami
+
+Each day lives in python/NN/dayNN.py and reads its own input in main().  The
+table below records how to parse the input and call the solve functions of
+each day so that the runner can drive all of them the same way.
+"""
+
+
+import collections
+import importlib.util
+import os
+
+from aoc import loader
+
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(os.path.dirname(PYTHON_DIR), 'data')
+
+
+Day = collections.namedtuple('Day', ['parse', 'parts', 'scale'], defaults=[None])
+
+
+def read_lines(path):
+    "Return the stripped lines of the file at path"
+    return list(loader.iter_lines(path))
+
+
+def repeat_lines(text, factor):
+    "Return an input with every line repeated factor times"
+    lines = text.splitlines()
+    return '\n'.join(lines * factor) + '\n'
+
+
+def repeat_blocks(text, factor):
+    "Return an input with the blank line separated blocks repeated factor times"
+    blocks = text.strip().split('\n\n')
+    return '\n\n'.join(blocks * factor) + '\n'
+
+
+def tile_grid(text, factor):
+    "Return a grid input tiled factor times across and factor times down"
+    rows = [row * factor for row in text.split()]
+    return '\n'.join(rows * factor) + '\n'
+
+
+def test_scaling():
+    assert repeat_lines('a\nb\n', 2) == 'a\nb\na\nb\n'
+    assert repeat_blocks('a\nb\n\nc\n', 2) == 'a\nb\n\nc\n\na\nb\n\nc\n'
+    assert tile_grid('ab\ncd\n', 2) == 'abab\ncdcd\nabab\ncdcd\n'
+
+
+def module_path(day):
+    return os.path.join(PYTHON_DIR, f'{day:02}', f'day{day:02}.py')
+
+
+def input_path(day):
+    return os.path.join(DATA_DIR, f'{day:02}', f'input{day:02}.txt')
+
+
+def find_days():
+    "Return the sorted day numbers that have a dayNN.py module"
+    days = []
+    for name in os.listdir(PYTHON_DIR):
+        if name.isdigit() and os.path.exists(module_path(int(name))):
+            days.append(int(name))
+    return sorted(days)
+
+
+def test_find_days():
+    assert find_days() == list(range(1, 26))
+
+
+def load_module(day):
+    "Import python/NN/dayNN.py as the module dayNN"
+    spec = importlib.util.spec_from_file_location(f'day{day:02}', module_path(day))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# For every day: how to turn the input file into the arguments of the solve
+# functions, how to compute each part from the parsed input, and, where the
+# puzzle allows it, how to build a larger input for benchmarking.
+DAYS = {
+    1: Day(
+        lambda m, path: read_lines(path),
+        {'a': lambda m, lines: m.solve_a(lines), 'b': lambda m, lines: m.solve_b(lines)},
+        repeat_lines,
+    ),
+    2: Day(
+        lambda m, path: m.parse_input(read_lines(path)),
+        {'a': lambda m, games: m.solve_a(games), 'b': lambda m, games: m.solve_b(games)},
+        repeat_lines,
+    ),
+    3: Day(
+        lambda m, path: read_lines(path),
+        {'a': lambda m, grid: m.solve(grid)[0], 'b': lambda m, grid: m.solve(grid)[1]},
+        tile_grid,
+    ),
+    4: Day(
+        lambda m, path: [m.parse_card(line) for line in read_lines(path)],
+        {'a': lambda m, cards: m.solve_a(cards), 'b': lambda m, cards: m.solve_b(cards)},
+        repeat_lines,
+    ),
+    5: Day(
+        lambda m, path: m.parse_input(read_lines(path)),
+        {'a': lambda m, data: m.solve_a(*data), 'b': lambda m, data: m.solve_b(*data)},
+    ),
+    6: Day(
+        lambda m, path: read_lines(path),
+        {
+            'a': lambda m, lines: m.solve_a(m.parse_input_a(lines)),
+            'b': lambda m, lines: m.solve_b(m.parse_input_b(lines)),
+        },
+    ),
+    7: Day(
+        lambda m, path: m.parse_input(loader.iter_lines(path)),
+        {'a': lambda m, hands: m.solve_a(hands), 'b': lambda m, hands: m.solve_b(hands)},
+        repeat_lines,
+    ),
+    8: Day(
+        lambda m, path: m.parse_input(read_lines(path)),
+        {'a': lambda m, data: m.solve_a(*data), 'b': lambda m, data: m.solve_b(*data)},
+    ),
+    9: Day(
+        lambda m, path: [[int(n) for n in line.split()] for line in read_lines(path)],
+        {'a': lambda m, seqs: m.solve_a(seqs), 'b': lambda m, seqs: m.solve_b(seqs)},
+        repeat_lines,
+    ),
+    10: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, grid: m.solve_a(grid), 'b': lambda m, grid: m.solve_b(grid)[1]},
+    ),
+    11: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, grid: m.solve(grid), 'b': lambda m, grid: m.solve(grid, 1000000)},
+        tile_grid,
+    ),
+    12: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, records: m.solve_a(records), 'b': lambda m, records: m.solve_b(records)},
+        repeat_lines,
+    ),
+    13: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, grids: m.solve_a(grids), 'b': lambda m, grids: m.solve_b(grids)},
+        repeat_blocks,
+    ),
+    14: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, grid: m.solve_a(grid), 'b': lambda m, grid: m.solve_b(grid)},
+    ),
+    15: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, seq: m.solve_a(seq), 'b': lambda m, seq: m.solve_b(seq)},
+    ),
+    16: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, grid: m.solve_a(grid), 'b': lambda m, grid: m.solve_b(grid)},
+        tile_grid,
+    ),
+    17: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, grid: m.solve(grid), 'b': lambda m, grid: m.solve(grid, m.ultimate_neighbors)},
+        tile_grid,
+    ),
+    18: Day(
+        lambda m, path: m.read_input(path),
+        {
+            'a': lambda m, digs: m.solve(digs),
+            'b': lambda m, digs: m.solve(m.translate_dig_instructions(digs)),
+        },
+        repeat_lines,
+    ),
+    19: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, data: m.solve_a(data[1], data[0]), 'b': lambda m, data: m.solve_b(data[0])},
+    ),
+    20: Day(
+        lambda m, path: m.parse_input(path),
+        {'a': lambda m, data: m.solve_a(*data), 'b': lambda m, data: m.solve_b(*data)},
+    ),
+    21: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, grid: m.solve_a(grid, 64), 'b': lambda m, grid: m.solve_b(grid)},
+    ),
+    22: Day(
+        lambda m, path: m.parse_input(path),
+        {'a': lambda m, bricks: m.solve(bricks)[0], 'b': lambda m, bricks: m.solve(bricks)[1]},
+    ),
+    23: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, grid: m.solve_a(grid), 'b': lambda m, grid: m.solve_b(grid)},
+    ),
+    24: Day(
+        lambda m, path: m.parse_input(path),
+        {
+            'a': lambda m, hailstones: m.solve_a(hailstones, (200000000000000, 400000000000000)),
+            'b': lambda m, hailstones: m.solve_b(hailstones),
+        },
+    ),
+    25: Day(
+        lambda m, path: m.read_input(path),
+        {'a': lambda m, edges: m.solve_a(edges)},
+    ),
+}
+
+
+def test_days_table():
+    assert sorted(DAYS) == find_days()
@@ -0,0 +1,159 @@
+"""
+Advent of Code
+A grid of characters backed by a numpy array
+jramaswami
+
+Many puzzles give a grid of characters as input.  Grid keeps it as a
+(height, width) array of uint8 character codes.  A cell can be addressed by
+(row, col) or by its flat index, row * width + col, and questions about the
+whole grid, like which cells are open or how many open neighbors each cell
+has, are answered with numpy operations on boolean masks instead of a loop
+over every cell.
+
+padded() surrounds the grid with a border of some character, usually a wall.
+Every neighbor of a cell inside the border is then inside the array, so a
+search over flat indices of the padded grid needs no bounds checks.
+"""
+
+
+import numpy as np
+
+from aoc import loader
+
+
+ORTHOGONAL = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIAGONAL = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+ALL_NEIGHBORS = ORTHOGONAL + DIAGONAL
+
+
+def codes(chars):
+    "Return the character codes of chars as a uint8 array"
+    return np.frombuffer(chars.encode('ascii'), dtype=np.uint8)
+
+
+class Grid:
+    def __init__(self, cells):
+        self.cells = cells
+        self.height, self.width = cells.shape
+
+    @classmethod
+    def from_lines(cls, lines):
+        "Return the grid for a list of equal length strings"
+        data = ''.join(lines).encode('ascii')
+        cells = np.frombuffer(data, dtype=np.uint8).reshape(len(lines), len(lines[0]))
+        return cls(cells)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Return the grid for newline separated rows in data.  The cells are a
+        view of data, not a copy.
+        """
+        return cls(loader.rows_view(data))
+
+    @classmethod
+    def read(cls, path):
+        "Return the grid in the file at path, viewing the memory mapped file"
+        return cls(loader.read_cells(path))
+
+    def __len__(self):
+        return self.height
+
+    def __repr__(self):
+        return f'Grid({self.height}x{self.width})'
+
+    def row(self, r):
+        "Return row r as a string"
+        return self.cells[r].tobytes().decode('ascii')
+
+    def rows(self):
+        return [self.row(r) for r in range(self.height)]
+
+    def inbounds(self, r, c):
+        return 0 <= r < self.height and 0 <= c < self.width
+
+    def flat(self, r, c):
+        "Return the flat index of (r, c)"
+        return r * self.width + c
+
+    def posn(self, i):
+        "Return the (r, c) of flat index i"
+        return divmod(i, self.width)
+
+    def flat_offsets(self, offsets):
+        "Return the flat index offsets for the given (dr, dc) offsets"
+        return tuple(dr * self.width + dc for dr, dc in offsets)
+
+    def mask(self, chars):
+        "Return a boolean array that is True where the cell is one of chars"
+        return np.isin(self.cells, codes(chars))
+
+    def find(self, char):
+        "Return (r, c) of the first cell holding char or None"
+        found = np.argwhere(self.cells == ord(char))
+        if len(found) == 0:
+            return None
+        r, c = found[0]
+        return int(r), int(c)
+
+    def padded(self, fill):
+        "Return a copy of the grid with a one cell border of fill"
+        return Grid(np.pad(self.cells, 1, constant_values=ord(fill)))
+
+
+def test_grid():
+    grid = Grid.from_bytes(b'#.#\n.S.\n#..')
+    assert (grid.height, grid.width) == (3, 3)
+    assert grid.rows() == ['#.#', '.S.', '#..']
+    assert Grid.from_lines(['#.#', '.S.', '#..']).rows() == grid.rows()
+    assert grid.find('S') == (1, 1)
+    assert grid.find('X') is None
+    assert grid.posn(grid.flat(2, 1)) == (2, 1)
+    assert grid.mask('#').sum() == 3
+    padded = grid.padded('#')
+    assert padded.rows() == ['#####', '##.##', '#.S.#', '##..#', '#####']
+    s = padded.flat(2, 2)
+    assert sorted(s + d for d in padded.flat_offsets(ORTHOGONAL)) == [7, 11, 13, 17]
+
+
+def shift(mask, dr, dc):
+    """
+    Return mask moved by (dr, dc), that is result[r, c] == mask[r-dr, c-dc].
+    Cells moved in from outside the grid are False.
+    """
+    result = np.zeros_like(mask)
+    h, w = mask.shape
+    result[max(dr, 0):h + min(dr, 0), max(dc, 0):w + min(dc, 0)] = (
+        mask[max(-dr, 0):h + min(-dr, 0), max(-dc, 0):w + min(-dc, 0)]
+    )
+    return result
+
+
+def dilate(mask, offsets=ORTHOGONAL):
+    "Return a mask of the cells that have a neighbor in mask"
+    result = np.zeros_like(mask)
+    for dr, dc in offsets:
+        result |= shift(mask, -dr, -dc)
+    return result
+
+
+def count_neighbors(mask, offsets=ORTHOGONAL):
+    "Return the number of neighbors of each cell that are in mask"
+    result = np.zeros(mask.shape, dtype=np.uint8)
+    for dr, dc in offsets:
+        result += shift(mask, -dr, -dc)
+    return result
+
+
+def test_mask_operations():
+    mask = np.array([
+        [False, False, False],
+        [False, True, False],
+        [False, False, True],
+    ])
+    assert shift(mask, 1, 0)[2, 1]
+    assert not shift(mask, 1, 0)[1, 1]
+    assert dilate(mask).sum() == 4
+    assert count_neighbors(mask)[1, 2] == 2
+    assert count_neighbors(mask, ALL_NEIGHBORS)[2, 2] == 1
+    assert count_neighbors(mask, ALL_NEIGHBORS)[0, 0] == 1
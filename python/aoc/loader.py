@@ -0,0 +1,88 @@
+"""
+Advent of Code
+Reading puzzle inputs without copying them
+jramaswami
+
+The input file is memory mapped, so the operating system pages it in as it
+is read.  Grid inputs become a numpy view of the mapped bytes.  Record
+inputs are streamed a line at a time, so only the lines a solver has not
+consumed yet are ever held as Python strings.
+"""
+
+
+import mmap
+import os
+
+
+NEWLINE = ord('\n')
+
+
+def map_file(path):
+    "Return a read only memory map of the file at path"
+    if os.path.getsize(path) == 0:
+        # An empty file cannot be mapped.
+        return b''
+    with open(path, 'rb') as infile:
+        # The map stays valid after the file is closed.
+        return mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_rows(path):
+    "Yield each line of the file at path, without its newline, as a memoryview"
+    data = map_file(path)
+    view = memoryview(data)
+    start = 0
+    while start < len(data):
+        end = data.find(b'\n', start)
+        if end == -1:
+            end = len(data)
+        yield view[start:end]
+        start = end + 1
+
+
+def iter_lines(path):
+    "Yield each stripped line of the file at path as a string"
+    for row in iter_rows(path):
+        yield str(row, 'ascii').strip()
+
+
+def rows_view(data):
+    """
+    Return a (height, width) uint8 array of the newline separated rows in
+    data, which may be anything supporting the buffer protocol.  The array
+    is a view of data with the newline column sliced away, not a copy.
+    """
+    import numpy as np
+    data = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(data == NEWLINE)
+    width = int(newlines[0]) if len(newlines) else len(data)
+    height = (len(data) + 1) // (width + 1)
+    if len(data) < height * (width + 1):
+        # The last row has no newline.
+        data = np.concatenate((data, np.array([NEWLINE], dtype=np.uint8)))
+    rows = data[:height * (width + 1)].reshape(height, width + 1)
+    return rows[:, :width]
+
+
+def read_cells(path):
+    "Return the grid in the file at path as a uint8 array viewing the mapped file"
+    return rows_view(map_file(path))
+
+
+def test_iter_lines():
+    path = os.path.join(os.path.dirname(__file__), '..', '..', 'data', '04', 'test04a.txt')
+    lines = list(iter_lines(path))
+    with open(path, 'r') as infile:
+        expected = [line.strip() for line in infile]
+    assert lines == expected
+    assert [bytes(r) for r in iter_rows(path)] == [t.encode() for t in expected]
+
+
+def test_read_cells():
+    path = os.path.join(os.path.dirname(__file__), '..', '..', 'data', '21', 'test21a.txt')
+    cells = read_cells(path)
+    with open(path, 'r') as infile:
+        expected = [line.strip() for line in infile]
+    assert cells.shape == (len(expected), len(expected[0]))
+    assert [r.tobytes().decode() for r in cells] == expected
+    assert rows_view(b'ab\ncd\n').tolist() == rows_view(b'ab\ncd').tolist()
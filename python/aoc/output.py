@@ -0,0 +1,57 @@
+"""
+Advent of Code
+Where main() sends the final answer
+jramaswami
+
+By default the answer is copied to the clipboard.  pyperclip is only imported
+when an answer is copied, and when it is not installed or there is no
+clipboard the answer is just not copied.  Any other function taking a string,
+for example print, can be used instead with set_sink().
+"""
+
+
+def clipboard(text):
+    """
+    Copy text to the clipboard when pyperclip and a clipboard are available.
+    Return True if it was copied.
+    """
+    try:
+        import pyperclip
+    except ImportError:
+        return False
+    try:
+        pyperclip.copy(text)
+    except pyperclip.PyperclipException:
+        return False
+    return True
+
+
+_sink = clipboard
+
+
+def set_sink(sink):
+    "Send answers to sink, a function taking a string, or nowhere if None."
+    global _sink
+    _sink = sink
+
+
+def copy(value):
+    """
+    Send the answer to the current sink.  Return False if there is no sink
+    or the sink returned False, as clipboard does when it could not copy.
+    """
+    if _sink is None:
+        return False
+    return _sink(str(value)) is not False
+
+
+def test_set_sink():
+    copied = []
+    set_sink(copied.append)
+    assert copy(42)
+    set_sink(None)
+    assert not copy(43)
+    set_sink(lambda text: False)
+    assert not copy(44)
+    set_sink(clipboard)
+    assert copied == ['42']
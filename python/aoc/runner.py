@@ -0,0 +1,95 @@
+"""
+Advent of Code
+Run all the daily solutions at once
+jramaswami
+
+Every part of every day is run as its own task in a process pool, so the time
+for the whole set is the time of the slowest part rather than the sum of all
+of them.
+
+Usage (from the python directory):
+
+    python -m aoc.runner              # run all days
+    python -m aoc.runner 16 17 23     # run some days
+    python -m aoc.runner -j 1         # run one part at a time
+"""
+
+
+import argparse
+import collections
+import concurrent.futures
+import os
+import time
+
+from aoc import days
+
+
+Result = collections.namedtuple('Result', ['day', 'part', 'answer', 'start', 'finish'])
+
+
+def run_part(day, part, path=None):
+    "Parse the input for day and compute the given part."
+    start = time.time()
+    module = days.load_module(day)
+    spec = days.DAYS[day]
+    data = spec.parse(module, path or days.input_path(day))
+    answer = spec.parts[part](module, data)
+    return Result(day, part, answer, start, time.time())
+
+
+def test_run_part():
+    result = run_part(1, 'a')
+    assert result.answer == 56042
+    result = run_part(1, 'b')
+    assert result.answer == 55358
+
+
+def run_days(selected_days, jobs=None):
+    "Run every part of the selected days in a process pool; return results by day."
+    tasks = [(day, part) for day in selected_days for part in days.DAYS[day].parts]
+    results = collections.defaultdict(list)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_part, day, part) for day, part in tasks]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results[result.day].append(result)
+    for day in results:
+        results[day].sort(key=lambda r: r.part)
+    return results
+
+
+def test_run_days():
+    results = run_days([1, 2], jobs=2)
+    assert [r.answer for r in results[1]] == [56042, 55358]
+    assert [r.answer for r in results[2]] == [2486, 87984]
+
+
+def report(results, wall_time):
+    "Print the answers and the wall time of each day."
+    for day in sorted(results):
+        day_results = results[day]
+        # The parts of a day run side by side so the day takes from the first
+        # start to the last finish.
+        day_time = max(r.finish for r in day_results) - min(r.start for r in day_results)
+        answers = '  '.join(f'{r.part}={r.answer}' for r in day_results)
+        print(f'Day {day:2}  {day_time:8.3f}s  {answers}')
+    print(f'Total   {wall_time:8.3f}s')
+
+
+def main():
+    "Main program"
+    parser = argparse.ArgumentParser(description='Run Advent of Code 2023 solutions.')
+    parser.add_argument('days', nargs='*', type=int, help='days to run (default: all)')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count(),
+        help='number of worker processes'
+    )
+    args = parser.parse_args()
+    selected_days = args.days or days.find_days()
+    start = time.time()
+    results = run_days(selected_days, args.jobs)
+    report(results, time.time() - start)
+
+
+if __name__ == '__main__':
+    main()